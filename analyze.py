@@ -1,10 +1,11 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import zscore
-from scipy.stats import poisson
+
+# scipy.stats takes about a second to import, so it's loaded by the functions that need it
 
 
 def estimate_probability_poisson_over(data, stat, n):
+    from scipy.stats import zscore, poisson
     z_scores = zscore(data[stat])
     abs_z_scores = np.abs(z_scores)
     filtered_entries = (abs_z_scores < 3)
@@ -14,6 +15,7 @@ def estimate_probability_poisson_over(data, stat, n):
     return probability
 
 def estimate_probability_poisson_under(data, stat, n):
+    from scipy.stats import zscore, poisson
     z_scores = zscore(data[stat])
     abs_z_scores = np.abs(z_scores)
     filtered_entries = (abs_z_scores < 3)
@@ -0,0 +1,232 @@
+import io
+import time
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import text
+
+from data_manager import DataManager, PLAYER_STATS_INDEX_ELEMENTS
+from ingest_metrics import IngestMetrics
+from models import Game, TradTeamStats, AdvTeamStats, TradPlayerStats, AdvPlayerStats
+from stat_normalization import normalize_stat_frame
+from rate_limiter import nba_api_limiter
+from sync_journal import run_journaled
+
+
+# boxscores key -> (model, columns of its unique constraint, id map attribute on DataManager)
+STAT_TABLES = {
+    "trad_team_stats": (TradTeamStats, ["game_id", "team_id"], "db_team_id_map"),
+    "adv_team_stats": (AdvTeamStats, ["game_id", "team_id"], "db_team_id_map"),
+    "trad_player_stats": (TradPlayerStats, PLAYER_STATS_INDEX_ELEMENTS, "db_player_id_map"),
+    "adv_player_stats": (AdvPlayerStats, PLAYER_STATS_INDEX_ELEMENTS, "db_player_id_map"),
+}
+
+
+def copy_frame(session, table_name, frame):
+    """Streams a frame into an existing table with COPY ... FROM STDIN."""
+    quote = session.bind.dialect.identifier_preparer.quote
+    buffer = io.StringIO()
+    # Nulls are written as \N so empty strings survive as empty strings
+    frame.to_csv(buffer, index=False, header=False, na_rep="\\N")
+    buffer.seek(0)
+    columns = ", ".join(quote(column) for column in frame.columns)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {quote(table_name)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+    finally:
+        cursor.close()
+
+
+def merge_staged(session, model, frame, index_elements):
+    """
+    Loads a normalized frame into a temp table with COPY, then merges it into the model's table
+    with one INSERT ... SELECT ... ON CONFLICT DO UPDATE. Committing is left to the caller.
+    """
+    if frame.empty:
+        return 0
+    quote = session.bind.dialect.identifier_preparer.quote
+    table_name = model.__tablename__
+    staging_name = f"staging_{table_name}"
+    # A statement may not update the same row twice, so keep the last stat line per key
+    frame = frame.drop_duplicates(subset=index_elements, keep="last")
+    columns = ", ".join(quote(column) for column in frame.columns)
+    updates = ", ".join(f"{quote(column)} = EXCLUDED.{quote(column)}" for column in frame.columns if column not in index_elements)
+
+    session.execute(text(f"DROP TABLE IF EXISTS {staging_name}"))
+    session.execute(text(f"CREATE TEMP TABLE {staging_name} ON COMMIT DROP AS SELECT {columns} FROM {table_name} WITH NO DATA"))
+    copy_frame(session, staging_name, frame)
+    session.execute(text(
+        f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_name} "
+        f"ON CONFLICT ({', '.join(index_elements)}) DO UPDATE SET {updates}"
+    ))
+    return len(frame)
+
+
+def load_batch(dm, batch, season, season_type):
+    """
+    Writes a batch of fetched games in one transaction: game rows through a multi-row upsert,
+    stat rows through COPY and a set-based merge per table.
+
+    Args:
+        dm (DataManager): Supplies the session and the nba -> database id maps.
+        batch (list): (game row, boxscores) pairs from DataManager.fetch_boxscores.
+        season (str): Season the games belong to.
+        season_type (str): "Regular Season" or "Playoffs".
+
+    Returns:
+        dict: Rows merged per table.
+    """
+    session = dm.get_session()
+    try:
+        dm.lock_games(session, [game["GAME_ID"] for game, _ in batch])
+        dm.require_season_partitions(session, season)
+        game_records = [dm.build_game_record(game, season, season_type, boxscores["game_summary"]) for game, boxscores in batch]
+        dm.upsert_records(session, Game, game_records, index_elements=["nba_game_id"])
+        nba_game_ids = [record["nba_game_id"] for record in game_records]
+        db_game_ids = dict(session.query(Game.nba_game_id, Game.id).filter(Game.nba_game_id.in_(nba_game_ids)).all())
+
+        row_counts = {}
+        for key, (model, index_elements, id_map_name) in STAT_TABLES.items():
+            frames = [boxscores[key] for _, boxscores in batch]
+            game_ids = [db_game_ids[int(game["GAME_ID"])] for game, boxscores in batch for _ in range(len(boxscores[key]))]
+            with dm.metrics.timed("normalize"):
+                stats = pd.concat(frames, ignore_index=True)
+                normalized = normalize_stat_frame(stats, model, game_ids, getattr(dm, id_map_name), season)
+            with dm.metrics.timed("copy"):
+                row_counts[model.__tablename__] = merge_staged(session, model, normalized, index_elements)
+            dm.metrics.record_rows(model.__tablename__, row_counts[model.__tablename__])
+        row_counts["player_game_logs"] = dm.refresh_player_game_logs(session, db_game_ids.values(), [season])
+        dm.commit(session)
+        dm.metrics.record_games(len(batch))
+        return row_counts
+
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def backfill_season(dm, season, season_type, batch_size=200, max_workers=4, max_attempts=5, retry_backoff=30, retry_failed=False,
+                    create_partitions=True):
+    """
+    Loads every game of a season through the COPY path, batch_size games per transaction.
+
+    Progress is kept in the sync journal, so rerunning an interrupted backfill only loads the games
+    that were not ingested yet, and games that failed are retried with backoff.
+
+    Args:
+        dm (DataManager): Used for game discovery, boxscore fetching and id maps.
+        season (str): Season to load, e.g. "2023-24".
+        season_type (str): "Regular Season" or "Playoffs".
+        batch_size (int): Games staged and merged per transaction.
+        max_workers (int): Threads fetching boxscores at once.
+        max_attempts (int): Failures after which a game is no longer retried.
+        retry_backoff (float): Seconds before the first retry round; doubles each round.
+        retry_failed (bool): Retry games that used up max_attempts in earlier runs.
+        create_partitions (bool): Create the season's partitions before pulling games; off when the caller already
+            did. load_batch checks for them either way.
+
+    Raises:
+        RuntimeError: If some games still failed after every attempt.
+    """
+    dm.metrics = IngestMetrics(f"backfill {season} {season_type}")
+    try:
+        if create_partitions:
+            dm.create_season_partitions(season)
+        games = dm.pull_all_games_from_season(season, season_type)
+        if games.empty:
+            print(f"No games found for {season} {season_type}.")
+            return
+        run_journaled(dm, games, season, season_type, lambda batch: load_batch(dm, batch, season, season_type),
+                      batch_size=batch_size, max_workers=max_workers, max_attempts=max_attempts, retry_backoff=retry_backoff,
+                      retry_failed=retry_failed)
+    finally:
+        dm.finish_ingest_run()
+
+
+def backfill_seasons(dm, seasons, season_types=("Regular Season", "Playoffs"), batch_size=200, max_workers=4):
+    """
+    Returns:
+        dict: (season, season_type) -> exception for the seasons that failed; the others still run.
+    """
+    failures = {}
+    for season in seasons:
+        for season_type in season_types:
+            try:
+                backfill_season(dm, season, season_type, batch_size, max_workers)
+            except Exception as e:
+                print(f"Backfill of {season} {season_type} failed: {e}")
+                failures[(season, season_type)] = e
+    return failures
+
+
+# DataManager of a backfill worker process, built once by init_backfill_worker
+worker_dm = None
+
+
+def init_backfill_worker(shared_state, requests_per_second, cache_dir):
+    global worker_dm
+    nba_api_limiter.set_rate(requests_per_second)
+    nba_api_limiter.share_budget(shared_state)
+    worker_dm = DataManager(cache_dir=cache_dir)
+
+
+def backfill_season_in_worker(season, season_type, batch_size, max_workers):
+    start = time.perf_counter()
+    # backfill_seasons_parallel created the partitions before starting the workers
+    backfill_season(worker_dm, season, season_type, batch_size, max_workers, create_partitions=False)
+    return time.perf_counter() - start
+
+
+def backfill_seasons_parallel(seasons, season_types=("Regular Season", "Playoffs"), processes=None, requests_per_second=3.0,
+                              batch_size=200, max_workers=4, cache_dir="api_cache"):
+    """
+    Backfills many seasons at once, one (season, season_type) pair per task on a process pool.
+
+    All workers draw from one adaptive nba_api request budget capped at requests_per_second, so adding processes
+    speeds up normalizing and loading without exceeding the API limit. Each batch takes an advisory
+    lock per game, so workers never write the same game at once.
+
+    Args:
+        seasons (list): Seasons to load, e.g. ["2019-20", "2020-21"].
+        season_types (tuple): Season types to load for every season.
+        processes (int): Worker processes; defaults to one per task, capped at the CPU count.
+        requests_per_second (float): nba_api budget shared by all workers.
+        batch_size (int): Games staged and merged per transaction.
+        max_workers (int): Threads fetching boxscores in each process.
+        cache_dir (str): Response cache directory for the workers.
+
+    Returns:
+        dict: (season, season_type) -> exception for the tasks that failed.
+    """
+    tasks = [(season, season_type) for season in seasons for season_type in season_types]
+    processes = processes or min(len(tasks), multiprocessing.cpu_count())
+    # The Regular Season and Playoffs tasks of a season would otherwise race to create the same
+    # partitions, and CREATE TABLE IF NOT EXISTS can still fail when two sessions run it at once
+    session = DataManager.get_session()
+    try:
+        for season in seasons:
+            DataManager.ensure_season_partitions(session, season)
+        session.commit()
+    finally:
+        session.close()
+    nba_api_limiter.set_rate(requests_per_second)
+    shared_state = nba_api_limiter.new_shared_state()
+    failures = {}
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_backfill_worker,
+                             initargs=(shared_state, requests_per_second, cache_dir)) as executor:
+        futures = {
+            executor.submit(backfill_season_in_worker, season, season_type, batch_size, max_workers): (season, season_type)
+            for season, season_type in tasks
+        }
+        for i, future in enumerate(as_completed(futures)):
+            season, season_type = futures[future]
+            try:
+                elapsed = future.result()
+                print(f"Finished {season} {season_type} in {elapsed:.1f}s ({i + 1}/{len(tasks)})")
+            except Exception as e:
+                # Progress is in the sync journal, so rerunning picks this task up where it stopped
+                print(f"Backfill of {season} {season_type} failed: {e}")
+                failures[(season, season_type)] = e
+    return failures
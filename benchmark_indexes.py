@@ -0,0 +1,115 @@
+"""Compares query plans and timings of the hot read paths with and without the hot path indexes.
+
+Each query is run with EXPLAIN ANALYZE as the schema stands, then again inside a transaction that
+drops the indexes it could use, which is rolled back afterwards. DROP INDEX holds an exclusive lock
+on the table until the rollback, so run this against a database nothing else is writing to.
+
+Usage: python benchmark_indexes.py [repeats]
+"""
+import sys
+from sqlalchemy import text
+
+from db_config import get_database_engine
+
+
+# name -> (SQL, indexes the query should use)
+QUERIES = {
+    "player game log": (
+        "SELECT t.*, a.*, g.date FROM trad_player_stats t "
+        "JOIN games g ON t.game_id = g.id "
+        "JOIN adv_player_stats a ON a.game_id = t.game_id AND a.player_id = t.player_id "
+        "WHERE t.player_id = :player_id ORDER BY g.date",
+        ["ix_trad_player_stats_player_id_game_id"],
+    ),
+    "player last 25 games": (
+        "SELECT points FROM player_game_logs WHERE player_id = :player_id ORDER BY date DESC LIMIT 25",
+        ["ix_player_game_logs_player_id_date"],
+    ),
+    "team game log": (
+        "SELECT t.*, a.*, g.date FROM trad_team_stats t "
+        "JOIN games g ON t.game_id = g.id "
+        "JOIN adv_team_stats a ON a.game_id = t.game_id AND a.team_id = t.team_id "
+        "WHERE t.team_id = :team_id ORDER BY g.date",
+        ["ix_trad_team_stats_team_id_game_id"],
+    ),
+    "season games by date": (
+        "SELECT id FROM games WHERE season = :season AND season_type = :season_type ORDER BY date",
+        ["ix_games_season_season_type_date"],
+    ),
+    "latest games": (
+        "SELECT * FROM games ORDER BY date DESC LIMIT 20",
+        ["ix_games_date", "ix_games_season_season_type_date"],
+    ),
+    "player by name": (
+        "SELECT id FROM players WHERE name = :player_name",
+        ["ix_players_name"],
+    ),
+    "team by nickname": (
+        "SELECT id FROM teams WHERE nickname = :team_nickname",
+        ["ix_teams_nickname"],
+    ),
+    "rolling averages lookup": (
+        # Served by the _rolling_game_team_uc unique constraint, listed as a baseline
+        "SELECT * FROM team_rolling_averages WHERE game_id = :game_id AND team_id = :team_id",
+        [],
+    ),
+}
+
+
+def sample_parameters(connection):
+    """Picks real ids and names from the database so every query has rows to find."""
+    player_id, player_name = connection.execute(text(
+        "SELECT p.id, p.name FROM players p JOIN trad_player_stats t ON t.player_id = p.id "
+        "GROUP BY p.id, p.name ORDER BY count(*) DESC LIMIT 1")).one()
+    team_id, team_nickname = connection.execute(text("SELECT id, nickname FROM teams ORDER BY id LIMIT 1")).one()
+    season, season_type = connection.execute(text("SELECT season, season_type FROM games ORDER BY date DESC LIMIT 1")).one()
+    rolling = connection.execute(text("SELECT game_id, team_id FROM team_rolling_averages LIMIT 1")).first()
+    game_id, rolling_team_id = rolling if rolling else (0, team_id)
+    return {
+        "player_id": player_id, "player_name": player_name, "team_id": team_id, "team_nickname": team_nickname,
+        "season": season, "season_type": season_type, "game_id": game_id,
+    }, rolling_team_id
+
+
+def explain(connection, sql, parameters, repeats):
+    """Returns (best execution ms, plan node types) over `repeats` EXPLAIN ANALYZE runs."""
+    best = None
+    for _ in range(repeats):
+        plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), parameters).scalar()[0]
+        best = plan["Execution Time"] if best is None else min(best, plan["Execution Time"])
+    nodes = []
+    stack = [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node["Node Type"] + (f" on {node['Index Name']}" if "Index Name" in node else ""))
+        stack.extend(reversed(node.get("Plans", [])))
+    return best, nodes
+
+
+def main(repeats=5):
+    engine = get_database_engine()
+    with engine.connect() as connection:
+        parameters, rolling_team_id = sample_parameters(connection)
+        connection.rollback()
+        for name, (sql, indexes) in QUERIES.items():
+            query_parameters = dict(parameters, team_id=rolling_team_id) if name == "rolling averages lookup" else parameters
+            with_indexes, plan_after = explain(connection, sql, query_parameters, repeats)
+            connection.rollback()
+
+            without_indexes, plan_before = with_indexes, plan_after
+            if indexes:
+                transaction = connection.begin()
+                for index in indexes:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {index}"))
+                without_indexes, plan_before = explain(connection, sql, query_parameters, repeats)
+                transaction.rollback()
+
+            print(f"{name}")
+            print(f"  without indexes {without_indexes:9.3f} ms  {' > '.join(plan_before)}")
+            print(f"  with indexes    {with_indexes:9.3f} ms  {' > '.join(plan_after)}")
+            if with_indexes:
+                print(f"  speedup: {without_indexes / with_indexes:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
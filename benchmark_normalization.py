@@ -0,0 +1,119 @@
+"""Times the stat normalization paths against the old iterrows path on synthetic boxscores.
+
+Usage: python benchmark_normalization.py [n_games]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from models import TradPlayerStats, AdvTeamStats
+from stat_normalization import normalize_stat_frame, to_records, stat_records
+
+
+TRAD_COLUMNS = ["FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB",
+                "AST", "STL", "BLK", "TO", "PF", "PTS", "PLUS_MINUS"]
+ADV_COLUMNS = ["E_OFF_RATING", "OFF_RATING", "E_DEF_RATING", "DEF_RATING", "E_NET_RATING", "NET_RATING", "AST_PCT",
+               "AST_TOV", "AST_RATIO", "OREB_PCT", "DREB_PCT", "REB_PCT", "E_TM_TOV_PCT", "TM_TOV_PCT", "EFG_PCT",
+               "TS_PCT", "USG_PCT", "E_USG_PCT", "E_PACE", "PACE", "PACE_PER40", "POSS", "PIE"]
+FLOAT_COLUMNS = {"FG_PCT", "FG3_PCT", "FT_PCT"} | set(ADV_COLUMNS) - {"POSS"}
+
+
+def make_boxscore(n_rows, id_column, ids, stat_columns, rng):
+    df = pd.DataFrame({id_column: ids, "START_POSITION": "", "MIN": [f"{m}:{s:02d}" for m, s in zip(rng.integers(0, 48, n_rows), rng.integers(0, 60, n_rows))]})
+    for column in stat_columns:
+        df[column] = rng.random(n_rows) if column in FLOAT_COLUMNS else rng.integers(0, 30, n_rows).astype(float)
+    return df
+
+
+def per_row_trad_player_records(trad_player_stats, db_game_id, db_player_id_map):
+    # The per-row conversion sync_trad_player_stats used before stat_normalization
+    records = []
+    for _, stat_line in trad_player_stats.iterrows():
+        if stat_line['PLAYER_ID'] not in db_player_id_map:
+            continue
+        record = {
+            'game_id': int(db_game_id),
+            'player_id': int(db_player_id_map[stat_line['PLAYER_ID']]),
+            'start_position': str(stat_line["START_POSITION"]),
+            'minutes': float(stat_line["MIN"].split(':')[0]),
+        }
+        for column in TRAD_COLUMNS:
+            value = stat_line[column]
+            record[column.lower()] = float(value) if column in FLOAT_COLUMNS else int(value)
+        records.append(record)
+    return records
+
+
+def per_row_adv_team_records(adv_team_stats, db_game_id, db_team_id_map):
+    # The per-row conversion sync_adv_team_stats used before stat_normalization
+    records = []
+    for _, stat_line in adv_team_stats.iterrows():
+        record = {
+            'game_id': int(db_game_id),
+            'team_id': int(db_team_id_map[stat_line['TEAM_ID']]),
+            'minutes': 0.0 if stat_line["MIN"] is None else float(stat_line["MIN"].split(':')[0]),
+        }
+        for column in ADV_COLUMNS:
+            value = stat_line[column]
+            if column == "POSS":
+                record[column.lower()] = 0 if value is None else int(value)
+            else:
+                record[column.lower()] = 0.0 if value is None else float(value)
+        records.append(record)
+    return records
+
+
+def time_path(label, function, frames, id_map):
+    start = time.perf_counter()
+    for db_game_id, frame in enumerate(frames):
+        function(frame, db_game_id, id_map)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  ({elapsed / len(frames) * 1000:.3f} ms/game)")
+    return elapsed
+
+
+def main(n_games=1230):
+    rng = np.random.default_rng(0)
+    player_map = {nba_id: db_id for db_id, nba_id in enumerate(range(1000, 1030))}
+    team_map = {1610612737: 1, 1610612738: 2}
+    player_frames = [make_boxscore(30, "PLAYER_ID", list(player_map), TRAD_COLUMNS, rng) for _ in range(n_games)]
+    team_frames = [make_boxscore(2, "TEAM_ID", list(team_map), ADV_COLUMNS, rng) for _ in range(n_games)]
+
+    vectorized_players = lambda df, game_id, id_map: to_records(normalize_stat_frame(df, TradPlayerStats, game_id, id_map, "2023-24"))
+    vectorized_teams = lambda df, game_id, id_map: to_records(normalize_stat_frame(df, AdvTeamStats, game_id, id_map))
+    per_game_players = lambda df, game_id, id_map: stat_records(df, TradPlayerStats, game_id, id_map, "2023-24")
+    per_game_teams = lambda df, game_id, id_map: stat_records(df, AdvTeamStats, game_id, id_map)
+
+    # Both paths have to agree before their timings mean anything
+    # The per-row path predates the season partition key, so leave it out of the comparison
+    without_season = [{k: v for k, v in record.items() if k != "season"} for record in vectorized_players(player_frames[0], 0, player_map)]
+    assert per_row_trad_player_records(player_frames[0], 0, player_map) == without_season
+    assert per_row_adv_team_records(team_frames[0], 0, team_map) == vectorized_teams(team_frames[0], 0, team_map)
+    assert per_game_players(player_frames[0], 0, player_map) == vectorized_players(player_frames[0], 0, player_map)
+    assert per_game_teams(team_frames[0], 0, team_map) == vectorized_teams(team_frames[0], 0, team_map)
+
+    print(f"{n_games} games, 30 player rows and 2 team rows each")
+    per_row = time_path("trad_player_stats per-row", per_row_trad_player_records, player_frames, player_map)
+    vectorized = time_path("trad_player_stats vectorized", vectorized_players, player_frames, player_map)
+    print(f"speedup: {per_row / vectorized:.1f}x")
+    # sync_games and live polling write one game at a time through stat_records
+    per_game = time_path("trad_player_stats per-game", per_game_players, player_frames, player_map)
+    print(f"speedup: {per_row / per_game:.1f}x")
+    # Backfills normalize a whole batch of games in one call
+    batch = pd.concat(player_frames, ignore_index=True)
+    batch_game_ids = np.repeat(np.arange(n_games), 30)
+    start = time.perf_counter()
+    to_records(normalize_stat_frame(batch, TradPlayerStats, batch_game_ids, player_map, "2023-24"))
+    batched = time.perf_counter() - start
+    print(f"{'trad_player_stats batched':<28} {batched:8.3f}s  ({batched / n_games * 1000:.3f} ms/game)")
+    print(f"speedup: {per_row / batched:.1f}x")
+    per_row = time_path("adv_team_stats per-row", per_row_adv_team_records, team_frames, team_map)
+    vectorized = time_path("adv_team_stats vectorized", vectorized_teams, team_frames, team_map)
+    print(f"speedup: {per_row / vectorized:.1f}x")
+    per_game = time_path("adv_team_stats per-game", per_game_teams, team_frames, team_map)
+    print(f"speedup: {per_row / per_game:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1230)
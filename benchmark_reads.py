@@ -0,0 +1,98 @@
+"""Times the DataFrame read paths against the ones they replaced on the current database.
+
+Cases:
+- adv_player_stats table and one player's game log: ORM hydration plus convert_to_df against read_frame.
+- last 25 games of one player: the whole game log cut down in pandas against LIMIT in SQL.
+- last 25 games of the 12 players with the most games: one query_player_game_log call per player,
+  a ROW_NUMBER() window and the LATERAL query of read_player_game_logs.
+- cached game logs: the same reads served from game_log_cache.
+
+Each read is repeated a few times and the best time is reported, with the memory of the resulting
+DataFrame and the speedup over the first path of the case.
+
+Usage: python benchmark_reads.py [repeats]
+"""
+import sys
+import time
+from sqlalchemy import func, select
+
+from data_manager import DataManager
+from models import PlayerGameLog
+from query_frames import read_frame
+
+
+def best_time(function, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def orm_player_game_log(session, player_id):
+    # How get_and_save_player_data built its frame before read_frame
+    data = session.query(PlayerGameLog).filter(PlayerGameLog.player_id == player_id).order_by(PlayerGameLog.date.desc()).all()
+    return DataManager.convert_to_df(data)
+
+
+def row_number_game_logs(session, player_ids, last_n):
+    # The window function alternative to the LATERAL query of read_player_game_logs
+    game_number = func.row_number().over(partition_by=PlayerGameLog.player_id, order_by=PlayerGameLog.date.desc()).label('game_number')
+    games = select(*PlayerGameLog.__table__.columns, game_number).where(PlayerGameLog.player_id.in_(player_ids)).subquery()
+    statement = select(*[column for column in games.c if column.name != 'game_number'])\
+        .where(games.c.game_number <= last_n).order_by(games.c.player_id, games.c.game_number)
+    return read_frame(session, statement)
+
+
+def main(repeats=5):
+    # game_log_cache_bytes=0 keeps every read but the cached case going to the database
+    dm = DataManager(cache_dir=None, game_log_cache_bytes=0)
+    cached_dm = DataManager(cache_dir=None)
+    with dm.session_scope() as session:
+        top_players = [top_player for top_player, in session.query(PlayerGameLog.player_id).group_by(PlayerGameLog.player_id).order_by(func.count().desc()).limit(12)]
+        player_id = top_players[0]
+        cases = {
+            "adv_player_stats table": [
+                ("ORM + convert_to_df", lambda: DataManager.convert_to_df((session.expunge_all(), dm.query_advanced_player_stats())[1])),
+                ("read_frame", lambda: dm.read_advanced_player_stats()),
+            ],
+            "player game log": [
+                ("ORM + convert_to_df", lambda: (session.expunge_all(), orm_player_game_log(session, player_id))[1]),
+                ("read_frame", lambda: dm.read_frame(list(PlayerGameLog.__table__.columns), PlayerGameLog.player_id == player_id,
+                                                     order_by=[PlayerGameLog.date.desc()])),
+            ],
+            "player last 25 games": [
+                ("whole log + head(25)", lambda: dm.query_player_game_log(player_id).head(25)),
+                ("LIMIT 25 in SQL", lambda: dm.query_player_game_log(player_id, last_n=25)),
+            ],
+            f"{len(top_players)} players' last 25 games": [
+                ("one query per player", lambda: [dm.query_player_game_log(top_player, last_n=25) for top_player in top_players]),
+                ("ROW_NUMBER() window", lambda: row_number_game_logs(session, top_players, 25)),
+                ("LATERAL", lambda: dm.read_player_game_logs(top_players, last_n=25)),
+            ],
+            "cached player last 25 games": [
+                ("query", lambda: dm.query_player_game_log(player_id, last_n=25)),
+                ("game_log_cache hit", lambda: cached_dm.query_player_game_log(player_id, last_n=25)),
+            ],
+            f"cached {len(top_players)} players' last 25 games": [
+                ("query", lambda: dm.query_player_game_logs(top_players, last_n=25)),
+                ("game_log_cache hit", lambda: cached_dm.query_player_game_logs(top_players, last_n=25)),
+            ],
+        }
+        for name, paths in cases.items():
+            print(name)
+            first_seconds = None
+            for label, read in paths:
+                seconds, df = best_time(read, repeats)
+                if isinstance(df, list):
+                    rows, megabytes = sum(len(part) for part in df), sum(part.memory_usage(deep=True).sum() for part in df) / 1e6
+                else:
+                    rows, megabytes = len(df), df.memory_usage(deep=True).sum() / 1e6
+                first_seconds = first_seconds or seconds
+                print(f"  {label:<24} {seconds * 1000:10.2f} ms  {rows:8d} rows  {megabytes:8.2f} MB  {first_seconds / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,31 +1,63 @@
 import time
+import queue
+import re
+import threading
 import itertools
 import pandas as pd
 import os
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from functools import wraps
+from contextlib import contextmanager
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, exists, text, select, update, true
 from sqlalchemy.dialects.postgresql import insert
-from requests.exceptions import HTTPError
-from nba_api.stats.static import teams
-from nba_api.stats.endpoints import leaguegamefinder
-from nba_api.stats.endpoints import commonteamroster
-from nba_api.stats.endpoints import boxscoresummaryv2
-from nba_api.stats.endpoints import boxscoretraditionalv2
-from nba_api.stats.endpoints import boxscoreadvancedv2
 
 import analyze
 import date_utils as date_mng
-from models import Team, Player, Game, TradTeamStats, AdvTeamStats, TradPlayerStats, AdvPlayerStats, TeamRollingAverages
+from models import Team, Player, Game, TradTeamStats, AdvTeamStats, TradPlayerStats, AdvPlayerStats, TeamRollingAverages, IngestRun, PlayerGameLog
 from db_config import get_database_engine, get_session
+from rate_limiter import nba_api_limiter, raise_for_status, track_nba_api_responses
+from response_cache import ResponseCache, CacheMiss, frames_from_payload
+from stat_normalization import stat_records
+from query_frames import read_frame
+from sync_journal import run_journaled
+from ingest_metrics import IngestMetrics
+from game_log_cache import GameLogCache
+
+
+# Stat tables partitioned by LIST (season); see ensure_season_partitions
+SEASON_PARTITIONED_MODELS = [TradPlayerStats, AdvPlayerStats]
+PLAYER_STATS_INDEX_ELEMENTS = ['game_id', 'player_id', 'season']
 
 
 class DataManager:
-    def __init__(self):
-        self.nba_team_id_map, self.nba_player_id_map = self.create_id_maps()
-        self.db_team_id_map = {v: k for k, v in self.nba_team_id_map.items()}
-        self.db_player_id_map = {v: k for k, v in self.nba_player_id_map.items()}
+    # Seconds before a cached response is re-fetched; finished games are cached with no expiry
+    LIVE_GAME_TTL = 60
+    GAME_FINDER_TTL = 15 * 60
+    ROSTER_TTL = 6 * 60 * 60
+    # First key of the two-key advisory locks taken per game, so they can't collide with other locks
+    GAME_LOCK_NAMESPACE = 2201
+    # Key of the advisory lock serializing partition creation; see ensure_season_partitions
+    PARTITION_LOCK_NAMESPACE = 2202
+    # Seconds between checks for games written by other processes; see check_game_log_watermarks
+    GAME_LOG_WATERMARK_INTERVAL = 30
+    # Seconds each check looks back past the last one, to catch writes that committed after it but
+    # stamped games.updated_at with their earlier transaction start
+    GAME_LOG_WATERMARK_OVERLAP = 5 * 60
+
+    def __init__(self, cache_dir="api_cache", replay=False, export_sink=None, game_log_cache_bytes=128 * 2**20):
+        self.scope = threading.local()
+        self.response_cache = ResponseCache(cache_dir, replay=replay)
+        self.game_log_cache = GameLogCache(game_log_cache_bytes)
+        self.game_log_watermark = None
+        self.game_log_versions = {}  # games.id -> updated_at of the games seen by the last watermark check
+        self.partitioned_seasons = set()  # seasons whose partitions are known to exist; see require_season_partitions
+        self.watermarks_checked_at = None
+        # Where get_and_save_player_data/get_and_save_team_data hand their frames, e.g. ExportSink("data_pile"); None saves nothing
+        self.export_sink = export_sink
+        self.metrics = IngestMetrics()
+        self.refresh_id_maps()
 
     @staticmethod
     def get_engine():
@@ -35,62 +67,193 @@ class DataManager:
     def get_session():
         return get_session()
 
+    @contextmanager
+    def session_scope(self, fresh=False):
+        """
+        Shares one session between every decorated method called inside the block, e.g.
+
+            with dm.session_scope():
+                for player_name in player_names:
+                    dm.get_team_rolling_stats(player_name)
+
+        Outside a scope each decorated call opens and closes its own session, as before. Scopes are
+        per thread, so worker threads never share a session, and nested scopes reuse the outer one.
+
+        The scope is for sharing reads, not a unit of work: it is never committed. Methods that commit
+        or roll back (the sync_* writes, create_season_partitions, save_ingest_run, ...) are marked
+        with transaction_management and always run in a session of their own, which they commit
+        whatever the caller does in the scope. So don't call them while the scope's session holds
+        uncommitted writes of the same rows, which their session would wait on.
+
+        Args:
+            fresh (bool): Open a new session for the block even inside another scope. The outer
+                scope's session is shared again once the block ends.
+        """
+        outer_session = getattr(self.scope, "session", None)
+        if outer_session is not None and not fresh:
+            yield outer_session
+            return
+        session = self.get_session()
+        self.scope.session = session
+        try:
+            yield session
+        finally:
+            self.scope.session = outer_session
+            session.close()
+
     @staticmethod
     def session_management(method):
         @wraps(method)
         def wrapper(self, *args, **kwargs):
-            session = self.get_session()
-            try:
+            # Calls made while a decorated method runs, like get_player_object inside get_team_rolling_stats, share its session
+            with self.session_scope() as session:
                 return method(self, session, *args, **kwargs)
-            finally:
-                session.close()
         return wrapper
 
+    @staticmethod
+    def transaction_management(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Methods that commit or roll back get their own session, so they can neither commit nor
+            # throw away work done in the caller's scope
+            with self.session_scope(fresh=True) as session:
+                return method(self, session, *args, **kwargs)
+        return wrapper
+
+    def fetch_endpoint(self, endpoint, ttl=None, refresh=False, **params):
+        """
+        Calls an nba_api endpoint through the response cache and returns {result set name: DataFrame}.
+        Network calls go through nba_api_limiter, which paces them and retries throttled requests.
+
+        Args:
+            endpoint (type): nba_api endpoint class, e.g. boxscoresummaryv2.BoxScoreSummaryV2.
+            ttl (float or callable): Seconds the response stays valid, None to keep it forever, or a
+                function taking the fetched frames and returning one of those. With ttl=None a response
+                cached with an expiry is re-fetched, since it was stored while the data could still change.
+            refresh (bool): Fetch from the network even if a cached response is still valid, e.g. while
+                polling a live game. The response is cached as usual. Ignored in replay mode.
+            **params: Keyword arguments for the endpoint.
+        """
+        endpoint_name = endpoint.__name__
+        if refresh and not self.response_cache.replay:
+            payload = None
+        else:
+            payload = self.response_cache.get(endpoint_name, params, permanent_only=ttl is None)
+        if payload is not None:
+            self.metrics.record_cache_hit(endpoint_name)
+            return frames_from_payload(payload)
+        if self.response_cache.replay:
+            raise CacheMiss(f"{endpoint_name} {params} is not cached and replay mode is on.")
+
+        attempts = []
+        track_nba_api_responses()
+
+        def request():
+            attempts.append(time.perf_counter())
+            response = endpoint(**params, get_request=False)
+            try:
+                response.get_request()
+            except Exception:
+                # nba_api parses the body before anything looks at the status, so a 429 or an error
+                # page shows up as a decode error; report the status instead so the limiter backs off
+                if response.nba_response is not None:
+                    raise_for_status(response.nba_response)
+                raise
+            raise_for_status(response.nba_response)
+            # nba_api keeps only the decoded text, so count the bytes of its UTF-8 encoding
+            return response.get_dict(), len(response.nba_response.get_response().encode("utf-8"))
+
+        try:
+            payload, n_bytes = nba_api_limiter.call(request)
+        except Exception:
+            self.metrics.record_error(endpoint_name, retries=len(attempts) - 1)
+            raise
+        self.metrics.record_call(endpoint_name, time.perf_counter() - attempts[-1], n_bytes, retries=len(attempts) - 1)
+        frames = frames_from_payload(payload)
+        if callable(ttl):
+            ttl = ttl(frames)
+        self.response_cache.put(endpoint_name, params, payload, ttl=ttl)
+        return frames
+
     @staticmethod
     def pull_teams():
+        # nba_api endpoints are imported where they are used, keeping them out of the import of this module
+        from nba_api.stats.static import teams
         nba_teams = teams.get_teams()
         return nba_teams
 
-    def pull_players(self):
-        teams = self.query_teams()
-        rosters = []
-        for team in teams:
-            retries = 5
-            for attempt in range(retries):
-                try:
-                    roster = commonteamroster.CommonTeamRoster(team_id=team.nba_team_id)
-                    roster_df = roster.get_data_frames()[0]
-                    time.sleep(0.5)
-                        
-                except HTTPError as e:
-                    if e.response.status_code == 429:
-                        wait = (attempt + 1) * 2  # Exponential back-off
-                        print(f"Rate limit hit, retrying in {wait} seconds...")
-                        time.sleep(wait)
-                    else:
-                        print(f"HTTP error occurred: {e}")
-                        break
-                except Exception as e:
-                    print(f"An error occurred: {e}")
-                    break
+    def pull_team_roster(self, team):
+        from nba_api.stats.endpoints import commonteamroster
+        try:
+            roster = self.fetch_endpoint(commonteamroster.CommonTeamRoster, ttl=self.ROSTER_TTL, team_id=team.nba_team_id)
+        except Exception as e:
+            print(f"An error occurred pulling the roster of {team.nickname}: {e}")
+            return None
+        roster_df = roster['CommonTeamRoster']
+        roster_df["db_team_id"] = team.id
+        return roster_df
+
+    def pull_players(self, max_workers=8):
+        """
+        Pulls every team's roster on a thread pool; the shared rate limiter keeps the calls within budget.
 
-                roster_df["db_team_id"] = team.id
-                rosters.append(roster_df)
+        Returns:
+            pd.DataFrame: CommonTeamRoster rows of all teams, with the database id of the team in db_team_id.
+        """
+        teams = self.query_teams()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rosters = [roster_df for roster_df in executor.map(self.pull_team_roster, teams) if roster_df is not None]
 
         players = pd.concat(rosters, axis=0, ignore_index=True)
         return players
     
-    @staticmethod
-    def pull_games_by_team_and_season(team, season, season_type):
+    def pull_games_by_team_and_season(self, team, season, season_type):
+        from nba_api.stats.endpoints import leaguegamefinder
         try:
-            gamefinder = leaguegamefinder.LeagueGameFinder(team_id_nullable=team.nba_team_id, season_nullable=season, season_type_nullable=season_type)
-            games_df = gamefinder.get_data_frames()[0]
+            gamefinder = self.fetch_endpoint(
+                leaguegamefinder.LeagueGameFinder,
+                ttl=self.GAME_FINDER_TTL,
+                team_id_nullable=team.nba_team_id,
+                season_nullable=season,
+                season_type_nullable=season_type,
+            )
+            games_df = gamefinder['LeagueGameFinderResults']
             print(games_df)
             return games_df
 
         except Exception as e:
             print(f"An error occurred: {e}")
-            print(gamefinder.get_json())
+
+    def pull_league_games(self, season, season_type, date_from=None, date_to=None):
+        from nba_api.stats.endpoints import leaguegamefinder
+        # One row per team per game; league_id keeps WNBA/G League games out of the result
+        gamefinder = self.fetch_endpoint(
+            leaguegamefinder.LeagueGameFinder,
+            ttl=self.GAME_FINDER_TTL,
+            league_id_nullable="00",
+            season_nullable=season,
+            season_type_nullable=season_type,
+            date_from_nullable=date_from,
+            date_to_nullable=date_to,
+        )
+        return gamefinder['LeagueGameFinderResults']
+
+    @staticmethod
+    def collapse_team_game_rows(games_df):
+        """
+        Collapses LeagueGameFinder's two rows per game (one per team) into one row per GAME_ID.
+
+        Returns:
+            pd.DataFrame: GAME_ID, GAME_DATE, SEASON_ID, TEAM_ID_HOME and TEAM_ID_AWAY for each game.
+        """
+        # Away teams are listed as "BOS @ LAL", home teams as "LAL vs. BOS"
+        is_away = games_df['MATCHUP'].str.contains('@', regex=False)
+        home = games_df.loc[~is_away, ['GAME_ID', 'TEAM_ID']].drop_duplicates('GAME_ID').rename(columns={'TEAM_ID': 'TEAM_ID_HOME'})
+        away = games_df.loc[is_away, ['GAME_ID', 'TEAM_ID']].drop_duplicates('GAME_ID').rename(columns={'TEAM_ID': 'TEAM_ID_AWAY'})
+        games = games_df[['GAME_ID', 'GAME_DATE', 'SEASON_ID']].drop_duplicates('GAME_ID')
+        games = games.merge(home, on='GAME_ID', how='left').merge(away, on='GAME_ID', how='left')
+        games[['TEAM_ID_HOME', 'TEAM_ID_AWAY']] = games[['TEAM_ID_HOME', 'TEAM_ID_AWAY']].astype('Int64')
+        return games.sort_values(by=['GAME_DATE', 'GAME_ID']).reset_index(drop=True)
 
     @session_management
     def query_players(self, session):
@@ -104,25 +267,54 @@ class DataManager:
         self.sync_all_team_records()
         self.sync_all_player_records()
     
-    def sync_all_player_records(self):
+    @transaction_management
+    def sync_all_player_records(self, session):
         players = self.pull_players()
-        for _, player_row in players.iterrows():
-            player = player_row.to_dict()
-            self.sync_player_record(player)
+        records = [self.build_player_record(player) for player in players.astype(object).where(players.notna(), None).to_dict('records')]
+        self.upsert_records(session, Player, records, index_elements=['nba_player_id'])
+        # Game logs copy the player's name and position, so carry over any that changed
+        changed_game_ids = session.execute(
+            update(PlayerGameLog)
+            .where(PlayerGameLog.player_id == Player.id)
+            .where((PlayerGameLog.player_name.is_distinct_from(Player.name)) | (PlayerGameLog.player_position.is_distinct_from(Player.position)))
+            .values(player_name=Player.name, player_position=Player.position)
+            .returning(PlayerGameLog.game_id)
+        ).scalars().all()
+        if changed_game_ids:
+            # Lets other processes' check_game_log_watermarks drop the renamed players' cached logs
+            self.touch_games(session, set(changed_game_ids))
+        self.commit(session)
+        print(f"Synced {len(records)} players.")
+        self.refresh_id_maps()
+        self.game_log_cache.invalidate("player")
+
+    @transaction_management
+    def sync_all_team_records(self, session):
+        records = [self.build_team_record(team) for team in self.pull_teams()]
+        stored_names = dict(session.execute(select(Team.nba_team_id, Team.full_name)).all())
+        self.upsert_records(session, Team, records, index_elements=['nba_team_id'])
+        renamed = [record['nba_team_id'] for record in records
+                   if record['nba_team_id'] in stored_names and stored_names[record['nba_team_id']] != record['full_name']]
+        if renamed:
+            # Team game logs read full_name, so let other processes' watermark checks drop them
+            renamed_ids = select(Team.id).where(Team.nba_team_id.in_(renamed))
+            game_ids = session.execute(
+                select(Game.id).where(Game.home_team_id.in_(renamed_ids) | Game.away_team_id.in_(renamed_ids))
+            ).scalars().all()
+            self.touch_games(session, game_ids)
+        self.commit(session)
+        print(f"Synced {len(records)} teams.")
+        self.refresh_id_maps()
+        self.game_log_cache.invalidate("team")
 
-    def sync_all_team_records(self):
-        teams = self.pull_teams()
-        for team in teams:
-            self.sync_team_record(team)
-
-    @session_management
-    def sync_player_record(self, session, player):
+    @staticmethod
+    def build_player_record(player):
         if not isinstance(player, dict):
             raise TypeError(f"Expected player to be a dictionary, got {type(player)} instead.")
 
-        insert_stmt = insert(Player).values(
+        return dict(
             nba_player_id=player["PLAYER_ID"],
-            team_id = self.db_team_id_map[player['TeamID']],
+            team_id=player['db_team_id'],
             name=player['PLAYER'],
             nickname=player["NICKNAME"],
             player_slug=player['PLAYER_SLUG'],
@@ -137,150 +329,178 @@ class DataManager:
             how_acquired=player['HOW_ACQUIRED']
         )
 
-        do_update_stmt = insert_stmt.on_conflict_do_update(
-            index_elements=['nba_player_id'],
-            set_={
-                'team_id': self.db_team_id_map[player['TeamID']],
-                'name': player['PLAYER'],
-                'nickname': player["NICKNAME"],
-                'player_slug': player['PLAYER_SLUG'],
-                'jersey_number': player['NUM'],
-                'position': player['POSITION'],
-                'height': player['HEIGHT'],
-                'weight': player['WEIGHT'],
-                'birth_date': player['BIRTH_DATE'],
-                'age': player['AGE'],
-                'experience': player['EXP'],
-                'school': player['SCHOOL'],
-                'how_acquired': player['HOW_ACQUIRED']
-            }
+    @staticmethod
+    def build_team_record(team):
+        return dict(
+            nba_team_id=team["id"],
+            nickname=team["nickname"],
+            city=team["city"],
+            state=team["state"],
+            full_name=team["full_name"],
+            abbreviation=team["abbreviation"],
         )
 
-        session.execute(do_update_stmt)
-        session.commit()
+    @transaction_management
+    def sync_player_record(self, session, player):
+        if 'db_team_id' not in player:
+            player = {**player, 'db_team_id': self.db_team_id_map[player['TeamID']]}
+        self.upsert_records(session, Player, [self.build_player_record(player)], index_elements=['nba_player_id'])
+        self.commit(session)
 
-    @session_management
+    @transaction_management
     def sync_team_record(self, session, team):
-        insert_stmt = insert(Team).values(
-            nba_team_id = team["id"],
-            nickname = team["nickname"],
-            city = team["city"],
-            state = team["state"],
-            full_name = team["full_name"],
-            abbreviation = team["abbreviation"],
-            )
-
-        do_update_stmt = insert_stmt.on_conflict_do_update(
-            index_elements=['nba_team_id'], # possible conflicting column
-            set_=dict(
-                nickname=insert_stmt.excluded.nickname,
-                city=insert_stmt.excluded.city,
-                state=insert_stmt.excluded.state,
-                full_name=insert_stmt.excluded.full_name,
-                abbreviation=insert_stmt.excluded.abbreviation
-            )
-        )
+        self.upsert_records(session, Team, [self.build_team_record(team)], index_elements=['nba_team_id'])
+        self.commit(session)
 
-        session.execute(do_update_stmt)
-        session.commit()
+    def refresh_id_maps(self):
+        self.nba_team_id_map, self.nba_player_id_map, self.team_nickname_map, self.player_name_map = self.create_id_maps()
+        self.db_team_id_map = {v: k for k, v in self.nba_team_id_map.items()}
+        self.db_player_id_map = {v: k for k, v in self.nba_player_id_map.items()}
+        self.team_id_nickname_map = {v: k for k, v in self.team_nickname_map.items()}
 
     def create_id_maps(self):   
         teams = self.query_teams()
         players = self.query_players()
         team_id_map = {}
         player_id_map = {}
+        team_nickname_map = {}
+        player_name_map = {}
         for team in teams:
             team_id_map[team.id] = team.nba_team_id
+            team_nickname_map[team.nickname] = team.id
 
         for player in players:
             player_id_map[player.id] = player.nba_player_id
+            player_name_map[player.name] = player.id
 
-        return team_id_map, player_id_map
+        return team_id_map, player_id_map, team_nickname_map, player_name_map
 
-    @staticmethod
-    def pull_traditional_stats_for_game(nba_game_id):
-        boxscore_traditional = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=nba_game_id)
+    def pull_traditional_stats_for_game(self, nba_game_id, ttl=LIVE_GAME_TTL, refresh=False):
+        from nba_api.stats.endpoints import boxscoretraditionalv2
+        boxscore_traditional = self.fetch_endpoint(boxscoretraditionalv2.BoxScoreTraditionalV2, ttl=ttl, refresh=refresh, game_id=nba_game_id)
         
-        player_stats = boxscore_traditional.player_stats.get_data_frame()
-        team_stats = boxscore_traditional.team_stats.get_data_frame()
+        player_stats = boxscore_traditional['PlayerStats']
+        team_stats = boxscore_traditional['TeamStats']
         player_stats = player_stats[player_stats["COMMENT"] == ""]
         return player_stats, team_stats
     
-    @staticmethod
-    def pull_advanced_stats_for_game(nba_game_id):
-        boxscore_advanced = boxscoreadvancedv2.BoxScoreAdvancedV2(game_id=nba_game_id)
+    def pull_advanced_stats_for_game(self, nba_game_id, ttl=LIVE_GAME_TTL, refresh=False):
+        from nba_api.stats.endpoints import boxscoreadvancedv2
+        boxscore_advanced = self.fetch_endpoint(boxscoreadvancedv2.BoxScoreAdvancedV2, ttl=ttl, refresh=refresh, game_id=nba_game_id)
 
-        player_stats = boxscore_advanced.player_stats.get_data_frame()
-        team_stats = boxscore_advanced.team_stats.get_data_frame()
+        player_stats = boxscore_advanced['PlayerStats']
+        team_stats = boxscore_advanced['TeamStats']
         player_stats = player_stats[player_stats["COMMENT"] == ""]
         return player_stats, team_stats
     
-    def pull_all_games_from_season(self, season, season_type):
-        teams = self.query_teams()
-        all_games = []
-        for team in teams:
-            team_games = self.pull_games_by_team_and_season(team, season, season_type)
-            all_games.append(team_games)
-        all_games = pd.concat(all_games, axis=0, ignore_index=True)
-        return all_games
+    def pull_all_games_from_season(self, season, season_type, date_from=None, date_to=None):
+        """
+        Discovers a season's games with a single league-wide LeagueGameFinder call.
 
-    @staticmethod
-    def pull_game_summary(game_id):
-            game_summary = boxscoresummaryv2.BoxScoreSummaryV2(game_id=game_id)
-            game_summary_df = game_summary.game_summary.get_data_frame()
+        Args:
+            season (str): Season to search, e.g. "2023-24".
+            season_type (str): "Regular Season" or "Playoffs".
+            date_from (date or str): Only include games on or after this date.
+            date_to (date or str): Only include games on or before this date.
+
+        Returns:
+            pd.DataFrame: One row per GAME_ID, see collapse_team_game_rows.
+        """
+        if date_from is not None and not isinstance(date_from, str):
+            date_from = date_mng.format_date(date_from)
+        if date_to is not None and not isinstance(date_to, str):
+            date_to = date_mng.format_date(date_to)
+        games_df = self.pull_league_games(season, season_type, date_from, date_to)
+        if games_df.empty:
+            return games_df
+        return self.collapse_team_game_rows(games_df)
+
+    def pull_game_summary(self, game_id, refresh=False):
+            from nba_api.stats.endpoints import boxscoresummaryv2
+            # Summaries of finished games never change, so they are cached for good
+            game_summary = self.fetch_endpoint(boxscoresummaryv2.BoxScoreSummaryV2, ttl=self.game_summary_ttl, refresh=refresh, game_id=game_id)
+            game_summary_df = game_summary['GameSummary']
             return game_summary_df
+
+    def game_summary_ttl(self, frames):
+        game_status_text = frames['GameSummary'].loc[0, 'GAME_STATUS_TEXT']
+        return None if self.is_final(game_status_text) else self.LIVE_GAME_TTL
+
+    def pull_boxscores_for_game(self, nba_game_id, game_summary=None, refresh=False):
+        """
+        Args:
+            nba_game_id (str): nba game id, e.g. "0022300061".
+            game_summary (pd.DataFrame): The game's GameSummary frame if already fetched.
+            refresh (bool): Bypass cached responses, see fetch_endpoint.
+        """
+        # The summary goes first so the stat boxscores inherit its cache lifetime. Once it is Final,
+        # ttl=None also replaces boxscores cached while the game was live instead of serving them
+        if game_summary is None:
+            game_summary = self.pull_game_summary(nba_game_id, refresh=refresh)
+        ttl = None if self.is_final(game_summary.loc[0, 'GAME_STATUS_TEXT']) else self.LIVE_GAME_TTL
+        adv_player_stats, adv_team_stats = self.pull_advanced_stats_for_game(nba_game_id, ttl=ttl, refresh=refresh)
+        trad_player_stats, trad_team_stats = self.pull_traditional_stats_for_game(nba_game_id, ttl=ttl, refresh=refresh)
+        return {
+            "game_summary": game_summary,
+            "trad_team_stats": trad_team_stats,
+            "adv_team_stats": adv_team_stats,
+            "trad_player_stats": trad_player_stats,
+            "adv_player_stats": adv_player_stats,
+        }
     
-    @session_management
-    def sync_game(self, session, game, season, season_type):
+    def build_game_record(self, game, season, season_type, game_summary):
+        game = pd.DataFrame(game).T
+        game_complete_row = pd.merge(game, game_summary, on="GAME_ID", how="inner")
+
+        # Ensure unique index labels and access values
+        return dict(
+            nba_game_id=int(game_complete_row.loc[0, 'GAME_ID']),
+            date=str(game_complete_row.loc[0, 'GAME_DATE']),
+            game_status_text=str(game_complete_row.loc[0, 'GAME_STATUS_TEXT']),
+            season=season,
+            season_type=season_type,
+            home_team_id=int(self.db_team_id_map[game_complete_row.loc[0, 'HOME_TEAM_ID']]),
+            away_team_id=int(self.db_team_id_map[game_complete_row.loc[0, 'VISITOR_TEAM_ID']]),
+            live_period=int(game_complete_row.loc[0, 'LIVE_PERIOD']),
+        )
 
-        try:
+    def upsert_game(self, session, game, season, season_type, game_summary=None):
+        if game_summary is None:
             game_summary = self.pull_game_summary(game.loc['GAME_ID'])
-            game = pd.DataFrame(game).T
-            game_complete_row = pd.merge(game, game_summary, on="GAME_ID", how="inner")
-
-            # Ensure unique index labels and access values
-            nba_game_id = int(game_complete_row.loc[0, 'GAME_ID'])
-            date = str(game_complete_row.loc[0, 'GAME_DATE'])
-            game_status_text = str(game_complete_row.loc[0, 'GAME_STATUS_TEXT'])
-            home_team_id = int(self.db_team_id_map[game_complete_row.loc[0, 'HOME_TEAM_ID']])
-            away_team_id = int(self.db_team_id_map[game_complete_row.loc[0, 'VISITOR_TEAM_ID']])
-            live_period = int(game_complete_row.loc[0, 'LIVE_PERIOD'])
-
-            # Create insert statement
-            insert_statement = insert(Game).values(
-                nba_game_id=nba_game_id,
-                date=date,
-                game_status_text=game_status_text,
-                season=season,
-                season_type=season_type,
-                home_team_id=home_team_id,
-                away_team_id=away_team_id,
-                live_period=live_period,
-            )
 
-            # Define fields to update on conflict
-            update_fields = {
-                'date': insert_statement.excluded.date,
-                'game_status_text': insert_statement.excluded.game_status_text,
-                'season': insert_statement.excluded.season,
-                'season_type': insert_statement.excluded.season_type,
-                'home_team_id': insert_statement.excluded.home_team_id,
-                'away_team_id': insert_statement.excluded.away_team_id,
-                'live_period': insert_statement.excluded.live_period,
-            }
+        # Create insert statement
+        insert_statement = insert(Game).values(**self.build_game_record(game, season, season_type, game_summary))
+
+        # Define fields to update on conflict
+        update_fields = {
+            'date': insert_statement.excluded.date,
+            'game_status_text': insert_statement.excluded.game_status_text,
+            'season': insert_statement.excluded.season,
+            'season_type': insert_statement.excluded.season_type,
+            'home_team_id': insert_statement.excluded.home_team_id,
+            'away_team_id': insert_statement.excluded.away_team_id,
+            'live_period': insert_statement.excluded.live_period,
+            'updated_at': func.now(),
+        }
 
-            # Create upsert statement
-            upsert_statement = insert_statement.on_conflict_do_update(
-                index_elements=['nba_game_id'],
-                set_=update_fields
-            ).returning(Game.id)
+        # Create upsert statement
+        upsert_statement = insert_statement.on_conflict_do_update(
+            index_elements=['nba_game_id'],
+            set_=update_fields
+        ).returning(Game.id)
 
-            # Execute the upsert statement and commit
+        # Execute the upsert statement and return the game ID
+        with self.metrics.timed("upsert"):
             result = session.execute(upsert_statement)
-            session.commit()
+            db_game_id = result.fetchone()[0]
+        self.metrics.record_rows(Game.__tablename__, 1)
+        return db_game_id
 
-            # Return the game ID
-            game_id = result.fetchone()[0]
+    @transaction_management
+    def sync_game(self, session, game, season, season_type, game_summary=None):
+        try:
+            game_id = self.upsert_game(session, game, season, season_type, game_summary)
+            self.commit(session)
             return game_id
 
         except Exception as e:
@@ -288,106 +508,73 @@ class DataManager:
             session.rollback()
             raise RuntimeError(f"Error syncing game {game.loc['GAME_ID']}: {str(e)}")
         
-    @session_management
+    def upsert_trad_team_stats(self, session, trad_team_stats, db_game_id):
+        with self.metrics.timed("normalize"):
+            records = stat_records(trad_team_stats, TradTeamStats, db_game_id, self.db_team_id_map)
+        return self.upsert_records(session, TradTeamStats, records, index_elements=['game_id', 'team_id'])
+
+    @transaction_management
     def sync_trad_team_stats(self, session, trad_team_stats, db_game_id):
-        db_ids = []
         try:
-            for _, stat_line in trad_team_stats.iterrows():
-                game_id = int(db_game_id)
-                team_id = int(self.db_team_id_map[stat_line['TEAM_ID']])
-                if stat_line["MIN"]:
-                    minutes = stat_line["MIN"].split(':')[0] 
-                    minutes = float(minutes)
-                else:
-                    minutes = 0
-                print(stat_line)
-                fgm = 0 if stat_line['FGM'] is None else int(stat_line["FGM"])
-                fga = 0 if stat_line['FGA'] is None else int(stat_line["FGA"])
-                fg_pct = 0.0 if stat_line['FG_PCT'] is None else float(stat_line["FG_PCT"])
-                fg3m = 0 if stat_line['FG3M'] is None else int(stat_line["FG3M"])
-                fg3a = 0 if stat_line['FG3A'] is None else int(stat_line["FG3A"])
-                fg3_pct = 0.0 if stat_line['FG3_PCT'] is None else float(stat_line["FG3_PCT"])
-                ftm = 0 if stat_line['FTM'] is None else int(stat_line["FTM"])
-                fta = 0 if stat_line['FTA'] is None else int(stat_line["FTA"])
-                ft_pct = 0.0 if stat_line['FT_PCT'] is None else float(stat_line["FT_PCT"])
-                oreb = 0 if stat_line['OREB'] is None else int(stat_line["OREB"])
-                dreb = 0 if stat_line['DREB'] is None else int(stat_line["DREB"])
-                reb = 0 if stat_line['REB'] is None else int(stat_line["REB"])
-                ast = 0 if stat_line['AST'] is None else int(stat_line["AST"])
-                stl = 0 if stat_line['STL'] is None else int(stat_line["STL"])
-                blk = 0 if stat_line['BLK'] is None else int(stat_line["BLK"])
-                to = 0 if stat_line['TO'] is None else int(stat_line["TO"])
-                pf = 0 if stat_line['PF'] is None else int(stat_line["PF"])
-                pts = 0 if stat_line['PTS'] is None else int(stat_line["PTS"])
-                plus_minus = 0 if stat_line['PLUS_MINUS'] is None else int(stat_line["PLUS_MINUS"])
-                # Create insert statement
-                insert_statement = insert(TradTeamStats).values(
-                    game_id=game_id,
-                    team_id=team_id,
-                    minutes=minutes,
-                    fgm=fgm,
-                    fga=fga,
-                    fg_pct=fg_pct,
-                    fg3m=fg3m,
-                    fg3a=fg3a,
-                    fg3_pct=fg3_pct,
-                    ftm=ftm,
-                    fta=fta,
-                    ft_pct=ft_pct,
-                    oreb=oreb,
-                    dreb=dreb,
-                    reb=reb,
-                    ast=ast,
-                    stl=stl,
-                    blk=blk,
-                    to=to,
-                    pf=pf,
-                    pts=pts,
-                    plus_minus=plus_minus
-                )
-
-                # Define fields to update on conflict
-                update_fields = {
-                    'minutes': insert_statement.excluded.minutes,
-                    'fgm': insert_statement.excluded.fgm,
-                    'fga': insert_statement.excluded.fga,
-                    'fg_pct': insert_statement.excluded.fg_pct,
-                    'fg3m': insert_statement.excluded.fg3m,
-                    'fg3a': insert_statement.excluded.fg3a,
-                    'fg3_pct': insert_statement.excluded.fg3_pct,
-                    'ftm': insert_statement.excluded.ftm,
-                    'fta': insert_statement.excluded.fta,
-                    'ft_pct': insert_statement.excluded.ft_pct,
-                    'oreb': insert_statement.excluded.oreb,
-                    'dreb': insert_statement.excluded.dreb,
-                    'reb': insert_statement.excluded.reb,
-                    'ast': insert_statement.excluded.ast,
-                    'stl': insert_statement.excluded.stl,
-                    'blk': insert_statement.excluded.blk,
-                    'to': insert_statement.excluded.to,
-                    'pf': insert_statement.excluded.pf,
-                    'pts': insert_statement.excluded.pts,
-                    'plus_minus': insert_statement.excluded.plus_minus
-                }
-
-                # Create upsert statement
-                upsert_statement = insert_statement.on_conflict_do_update(
-                    index_elements=['game_id', 'team_id'],
-                    set_=update_fields
-                ).returning(TradTeamStats.id)
-
-                # Execute the upsert statement and commit
-                result = session.execute(upsert_statement)
-                session.commit()
-                db_id = result.fetchone()[0]  # Extract the ID
-                db_ids.append(db_id)
+            db_ids = self.upsert_trad_team_stats(session, trad_team_stats, db_game_id)
+            self.touch_games(session, [db_game_id])
+            self.commit(session)
         except Exception as e:
             # Rollback in case of exception and raise the error
             session.rollback()
-            raise RuntimeError(f"Error syncing game {game_id}: {str(e)}")
+            raise RuntimeError(f"Error syncing game {db_game_id}: {str(e)}")
         
         return db_ids
 
+    def commit(self, session):
+        with self.metrics.timed("commit"):
+            session.commit()
+        self.metrics.record_commit()
+
+    def upsert_records(self, session, model, records, index_elements):
+        """
+        Upserts many rows with a single INSERT ... ON CONFLICT DO UPDATE and returns their ids.
+
+        Args:
+            session: Open session; committing is left to the caller.
+            model: Mapped class to write to.
+            records (list of dict): Rows keyed by column name, all with the same keys.
+            index_elements (list): Columns of the unique constraint to upsert on.
+
+        Returns:
+            list: Database ids of the upserted rows.
+        """
+        if not records:
+            return []
+        if model in SEASON_PARTITIONED_MODELS:
+            # Rows of a season without its partition would land in the default one and block creating it later
+            for season in {record['season'] for record in records}:
+                self.require_season_partitions(session, season)
+        # Postgres rejects a statement that touches the same conflict key twice, so keep the last row per key
+        records = list({tuple(record[column] for column in index_elements): record for record in records}.values())
+        insert_statement = insert(model).values(records)
+        update_fields = {column: insert_statement.excluded[column] for column in records[0] if column not in index_elements}
+        upsert_statement = insert_statement.on_conflict_do_update(
+            index_elements=index_elements,
+            set_=update_fields
+        ).returning(model.id)
+        with self.metrics.timed("upsert"):
+            result = session.execute(upsert_statement)
+            db_ids = [row[0] for row in result.fetchall()]
+        self.metrics.record_rows(model.__tablename__, len(records))
+        return db_ids
+
+    @staticmethod
+    def lock_games(session, nba_game_ids):
+        """
+        Takes a transaction-scoped Postgres advisory lock per game, so concurrent workers never write
+        the same game at once. Locks are taken in sorted order to avoid deadlocks and are released on
+        commit or rollback.
+        """
+        for nba_game_id in sorted({int(nba_game_id) for nba_game_id in nba_game_ids}):
+            session.execute(text("SELECT pg_advisory_xact_lock(:namespace, :nba_game_id)"),
+                            {"namespace": DataManager.GAME_LOCK_NAMESPACE, "nba_game_id": nba_game_id})
+
     @staticmethod
     def safe_float(value):
         return 0.0 if value is None else float(value)
@@ -396,347 +583,501 @@ class DataManager:
     def safe_int(value):
         return 0 if value is None else int(value)
     
-    @session_management
+    def upsert_adv_team_stats(self, session, adv_team_stats, db_game_id):
+        with self.metrics.timed("normalize"):
+            records = stat_records(adv_team_stats, AdvTeamStats, db_game_id, self.db_team_id_map)
+        return self.upsert_records(session, AdvTeamStats, records, index_elements=['game_id', 'team_id'])
+
+    @transaction_management
     def sync_adv_team_stats(self, session, adv_team_stats, db_game_id):
-        db_ids = []
         try:
-            for _, stat_line in adv_team_stats.iterrows():
-                game_id = int(db_game_id)
-                team_id = int(self.db_team_id_map[stat_line['TEAM_ID']])
-                minutes = self.safe_float(stat_line["MIN"].split(':')[0])
-                e_off_rating = self.safe_float(stat_line["E_OFF_RATING"])
-                off_rating = self.safe_float(stat_line["OFF_RATING"])
-                e_def_rating = self.safe_float(stat_line["E_DEF_RATING"])
-                def_rating = self.safe_float(stat_line["DEF_RATING"])
-                e_net_rating = self.safe_float(stat_line["E_NET_RATING"])
-                net_rating = self.safe_float(stat_line["NET_RATING"])
-                ast_pct = self.safe_float(stat_line["AST_PCT"])
-                ast_tov = self.safe_float(stat_line["AST_TOV"])
-                ast_ratio = self.safe_float(stat_line["AST_RATIO"])
-                oreb_pct = self.safe_float(stat_line["OREB_PCT"])
-                dreb_pct = self.safe_float(stat_line["DREB_PCT"])
-                reb_pct = self.safe_float(stat_line["REB_PCT"])
-                e_tm_tov_pct = self.safe_float(stat_line["E_TM_TOV_PCT"])
-                tm_tov_pct = self.safe_float(stat_line["TM_TOV_PCT"])
-                efg_pct = self.safe_float(stat_line["EFG_PCT"])
-                ts_pct = self.safe_float(stat_line["TS_PCT"])
-                usg_pct = self.safe_float(stat_line["USG_PCT"])
-                e_usg_pct = self.safe_float(stat_line["E_USG_PCT"])
-                e_pace = self.safe_float(stat_line["E_PACE"])
-                pace = self.safe_float(stat_line["PACE"])
-                pace_per40 = self.safe_float(stat_line["PACE_PER40"])
-                poss = self.safe_int(stat_line["POSS"])
-                pie = self.safe_float(stat_line["PIE"])
-
-                # Create insert statement
-                insert_statement = insert(AdvTeamStats).values(
-                    game_id=game_id,
-                    team_id=team_id,
-                    minutes=minutes,
-                    e_off_rating=e_off_rating,
-                    off_rating=off_rating,
-                    e_def_rating=e_def_rating,
-                    def_rating=def_rating,
-                    e_net_rating=e_net_rating,
-                    net_rating=net_rating,
-                    ast_pct=ast_pct,
-                    ast_tov=ast_tov,
-                    ast_ratio=ast_ratio,
-                    oreb_pct=oreb_pct,
-                    dreb_pct=dreb_pct,
-                    reb_pct=reb_pct,
-                    e_tm_tov_pct=e_tm_tov_pct,
-                    tm_tov_pct=tm_tov_pct,
-                    efg_pct=efg_pct,
-                    ts_pct=ts_pct,
-                    usg_pct=usg_pct,
-                    e_usg_pct=e_usg_pct,
-                    e_pace=e_pace,
-                    pace=pace,
-                    pace_per40=pace_per40,
-                    poss=poss,
-                    pie=pie
-                )
-
-                # Define fields to update on conflict
-                update_fields = {
-                    'minutes': insert_statement.excluded.minutes,
-                    'e_off_rating': insert_statement.excluded.e_off_rating,
-                    'off_rating': insert_statement.excluded.off_rating,
-                    'e_def_rating': insert_statement.excluded.e_def_rating,
-                    'def_rating': insert_statement.excluded.def_rating,
-                    'e_net_rating': insert_statement.excluded.e_net_rating,
-                    'net_rating': insert_statement.excluded.net_rating,
-                    'ast_pct': insert_statement.excluded.ast_pct,
-                    'ast_tov': insert_statement.excluded.ast_tov,
-                    'ast_ratio': insert_statement.excluded.ast_ratio,
-                    'oreb_pct': insert_statement.excluded.oreb_pct,
-                    'dreb_pct': insert_statement.excluded.dreb_pct,
-                    'reb_pct': insert_statement.excluded.reb_pct,
-                    'e_tm_tov_pct': insert_statement.excluded.e_tm_tov_pct,
-                    'tm_tov_pct': insert_statement.excluded.tm_tov_pct,
-                    'efg_pct': insert_statement.excluded.efg_pct,
-                    'ts_pct': insert_statement.excluded.ts_pct,
-                    'usg_pct': insert_statement.excluded.usg_pct,
-                    'e_usg_pct': insert_statement.excluded.e_usg_pct,
-                    'e_pace': insert_statement.excluded.e_pace,
-                    'pace': insert_statement.excluded.pace,
-                    'pace_per40': insert_statement.excluded.pace_per40,
-                    'poss': insert_statement.excluded.poss,
-                    'pie': insert_statement.excluded.pie
-                }
-
-                # Create upsert statement
-                upsert_statement = insert_statement.on_conflict_do_update(
-                    index_elements=['game_id', 'team_id'],
-                    set_=update_fields
-                ).returning(AdvTeamStats.id)
-
-                # Execute the upsert statement and commit
-                result = session.execute(upsert_statement)
-                session.commit()
-                db_id = result.fetchone()[0]  # Extract the ID
-                db_ids.append(db_id)
+            db_ids = self.upsert_adv_team_stats(session, adv_team_stats, db_game_id)
+            self.touch_games(session, [db_game_id])
+            self.commit(session)
         except Exception as e:
             # Rollback in case of exception and raise the error
             session.rollback()
-            raise RuntimeError(f"Error syncing game {game_id}: {str(e)}")
+            raise RuntimeError(f"Error syncing game {db_game_id}: {str(e)}")
         
         return db_ids
     
-    @session_management
-    def sync_trad_player_stats(self, session, trad_player_stats, db_game_id):
-        db_ids = []
+    @staticmethod
+    def query_game_season(session, db_game_id):
+        # Player stat rows are routed to their season's partition, so writes need the game's season
+        return session.query(Game.season).filter(Game.id == db_game_id).scalar()
+
+    def upsert_trad_player_stats(self, session, trad_player_stats, db_game_id, season=None):
+        season = season or self.query_game_season(session, db_game_id)
+        with self.metrics.timed("normalize"):
+            records = stat_records(trad_player_stats, TradPlayerStats, db_game_id, self.db_player_id_map, season)
+        return self.upsert_records(session, TradPlayerStats, records, index_elements=PLAYER_STATS_INDEX_ELEMENTS)
+
+    @transaction_management
+    def sync_trad_player_stats(self, session, trad_player_stats, db_game_id, season=None):
         try:
-            for _, stat_line in trad_player_stats.iterrows():
-                game_id = int(db_game_id)
-                if stat_line['PLAYER_ID'] not in self.db_player_id_map:
-                    continue
-                player_id = int(self.db_player_id_map[stat_line['PLAYER_ID']])
-                start_position = str(stat_line["START_POSITION"])
-                minutes = stat_line["MIN"].split(':')[0] 
-                minutes = float(minutes)
-                fgm = int(stat_line["FGM"])
-                fga = int(stat_line["FGA"])
-                fg_pct = float(stat_line["FG_PCT"])
-                fg3m = int(stat_line["FG3M"])
-                fg3a = int(stat_line["FG3A"])
-                fg3_pct = float(stat_line["FG3_PCT"])
-                ftm = int(stat_line["FTM"])
-                fta = int(stat_line["FTA"])
-                ft_pct = float(stat_line["FT_PCT"])
-                oreb = int(stat_line["OREB"])
-                dreb = int(stat_line["DREB"])
-                reb = int(stat_line["REB"])
-                ast = int(stat_line["AST"])
-                stl = int(stat_line["STL"])
-                blk = int(stat_line["BLK"])
-                to = int(stat_line["TO"])
-                pf = int(stat_line["PF"])
-                pts = int(stat_line["PTS"])
-                plus_minus = int(stat_line["PLUS_MINUS"])
-
-                # Create insert statement
-                insert_statement = insert(TradPlayerStats).values(
-                    game_id=game_id,
-                    player_id=player_id,
-                    start_position=start_position,
-                    minutes=minutes,
-                    fgm=fgm,
-                    fga=fga,
-                    fg_pct=fg_pct,
-                    fg3m=fg3m,
-                    fg3a=fg3a,
-                    fg3_pct=fg3_pct,
-                    ftm=ftm,
-                    fta=fta,
-                    ft_pct=ft_pct,
-                    oreb=oreb,
-                    dreb=dreb,
-                    reb=reb,
-                    ast=ast,
-                    stl=stl,
-                    blk=blk,
-                    to=to,
-                    pf=pf,
-                    pts=pts,
-                    plus_minus=plus_minus
-                )
-
-                # Define fields to update on conflict
-                update_fields = {
-                    'start_position': insert_statement.excluded.start_position,
-                    'minutes': insert_statement.excluded.minutes,
-                    'fgm': insert_statement.excluded.fgm,
-                    'fga': insert_statement.excluded.fga,
-                    'fg_pct': insert_statement.excluded.fg_pct,
-                    'fg3m': insert_statement.excluded.fg3m,
-                    'fg3a': insert_statement.excluded.fg3a,
-                    'fg3_pct': insert_statement.excluded.fg3_pct,
-                    'ftm': insert_statement.excluded.ftm,
-                    'fta': insert_statement.excluded.fta,
-                    'ft_pct': insert_statement.excluded.ft_pct,
-                    'oreb': insert_statement.excluded.oreb,
-                    'dreb': insert_statement.excluded.dreb,
-                    'reb': insert_statement.excluded.reb,
-                    'ast': insert_statement.excluded.ast,
-                    'stl': insert_statement.excluded.stl,
-                    'blk': insert_statement.excluded.blk,
-                    'to': insert_statement.excluded.to,
-                    'pf': insert_statement.excluded.pf,
-                    'pts': insert_statement.excluded.pts,
-                    'plus_minus': insert_statement.excluded.plus_minus
-                }
-
-                # Create upsert statement
-                upsert_statement = insert_statement.on_conflict_do_update(
-                    index_elements=['game_id', 'player_id'],
-                    set_=update_fields
-                ).returning(TradPlayerStats.id)
-
-                # Execute the upsert statement and commit
-                result = session.execute(upsert_statement)
-                session.commit()
-                db_id = result.fetchone()[0]  # Extract the ID
-                db_ids.append(db_id)
+            season = season or self.query_game_season(session, db_game_id)
+            db_ids = self.upsert_trad_player_stats(session, trad_player_stats, db_game_id, season)
+            self.refresh_player_game_logs(session, [db_game_id], [season])
+            self.commit(session)
         except Exception as e:
             # Rollback in case of exception and raise the error
             session.rollback()
-            raise RuntimeError(f"Error syncing game {game_id}: {str(e)}")
+            raise RuntimeError(f"Error syncing game {db_game_id}: {str(e)}")
         
         return db_ids
     
-    @session_management
-    def sync_adv_player_stats(self, session, adv_player_stats, db_game_id):
-        db_ids = []
+    def upsert_adv_player_stats(self, session, adv_player_stats, db_game_id, season=None):
+        season = season or self.query_game_season(session, db_game_id)
+        with self.metrics.timed("normalize"):
+            records = stat_records(adv_player_stats, AdvPlayerStats, db_game_id, self.db_player_id_map, season)
+        return self.upsert_records(session, AdvPlayerStats, records, index_elements=PLAYER_STATS_INDEX_ELEMENTS)
+
+    @transaction_management
+    def sync_adv_player_stats(self, session, adv_player_stats, db_game_id, season=None):
         try:
-            for _, stat_line in adv_player_stats.iterrows():
-                game_id = int(db_game_id)
-                if stat_line['PLAYER_ID'] not in self.db_player_id_map:
-                    continue
-                player_id = int(self.db_player_id_map[stat_line['PLAYER_ID']])
-                minutes = float(stat_line["MIN"].split(':')[0])  # Extract the minutes part and convert to float
-                e_off_rating = float(stat_line["E_OFF_RATING"])
-                off_rating = float(stat_line["OFF_RATING"])
-                e_def_rating = float(stat_line["E_DEF_RATING"])
-                def_rating = float(stat_line["DEF_RATING"])
-                e_net_rating = float(stat_line["E_NET_RATING"])
-                net_rating = float(stat_line["NET_RATING"])
-                ast_pct = float(stat_line["AST_PCT"])
-                ast_tov = float(stat_line["AST_TOV"])
-                ast_ratio = float(stat_line["AST_RATIO"])
-                oreb_pct = float(stat_line["OREB_PCT"])
-                dreb_pct = float(stat_line["DREB_PCT"])
-                reb_pct = float(stat_line["REB_PCT"])
-                tm_tov_pct = float(stat_line["TM_TOV_PCT"])
-                efg_pct = float(stat_line["EFG_PCT"])
-                ts_pct = float(stat_line["TS_PCT"])
-                usg_pct = float(stat_line["USG_PCT"])
-                e_usg_pct = float(stat_line["E_USG_PCT"])
-                e_pace = float(stat_line["E_PACE"])
-                pace = float(stat_line["PACE"])
-                pace_per40 = float(stat_line["PACE_PER40"])
-                poss = int(stat_line["POSS"])
-                pie = float(stat_line["PIE"])
-
-                # Create insert statement
-                insert_statement = insert(AdvPlayerStats).values(
-                    game_id=game_id,
-                    player_id=player_id,
-                    minutes=minutes,
-                    e_off_rating=e_off_rating,
-                    off_rating=off_rating,
-                    e_def_rating=e_def_rating,
-                    def_rating=def_rating,
-                    e_net_rating=e_net_rating,
-                    net_rating=net_rating,
-                    ast_pct=ast_pct,
-                    ast_tov=ast_tov,
-                    ast_ratio=ast_ratio,
-                    oreb_pct=oreb_pct,
-                    dreb_pct=dreb_pct,
-                    reb_pct=reb_pct,
-                    tm_tov_pct=tm_tov_pct,
-                    efg_pct=efg_pct,
-                    ts_pct=ts_pct,
-                    usg_pct=usg_pct,
-                    e_usg_pct=e_usg_pct,
-                    e_pace=e_pace,
-                    pace=pace,
-                    pace_per40=pace_per40,
-                    poss=poss,
-                    pie=pie
-                )
-
-                # Define fields to update on conflict
-                update_fields = {
-                    'minutes': insert_statement.excluded.minutes,
-                    'e_off_rating': insert_statement.excluded.e_off_rating,
-                    'off_rating': insert_statement.excluded.off_rating,
-                    'e_def_rating': insert_statement.excluded.e_def_rating,
-                    'def_rating': insert_statement.excluded.def_rating,
-                    'e_net_rating': insert_statement.excluded.e_net_rating,
-                    'net_rating': insert_statement.excluded.net_rating,
-                    'ast_pct': insert_statement.excluded.ast_pct,
-                    'ast_tov': insert_statement.excluded.ast_tov,
-                    'ast_ratio': insert_statement.excluded.ast_ratio,
-                    'oreb_pct': insert_statement.excluded.oreb_pct,
-                    'dreb_pct': insert_statement.excluded.dreb_pct,
-                    'reb_pct': insert_statement.excluded.reb_pct,
-                    'tm_tov_pct': insert_statement.excluded.tm_tov_pct,
-                    'efg_pct': insert_statement.excluded.efg_pct,
-                    'ts_pct': insert_statement.excluded.ts_pct,
-                    'usg_pct': insert_statement.excluded.usg_pct,
-                    'e_usg_pct': insert_statement.excluded.e_usg_pct,
-                    'e_pace': insert_statement.excluded.e_pace,
-                    'pace': insert_statement.excluded.pace,
-                    'pace_per40': insert_statement.excluded.pace_per40,
-                    'poss': insert_statement.excluded.poss,
-                    'pie': insert_statement.excluded.pie
-                }
-
-                # Create upsert statement
-                upsert_statement = insert_statement.on_conflict_do_update(
-                    index_elements=['game_id', 'player_id'],
-                    set_=update_fields
-                ).returning(AdvPlayerStats.id)
-
-                # Execute the upsert statement and commit
-                result = session.execute(upsert_statement)
-                session.commit()
-                db_id = result.fetchone()[0]  # Extract the ID
-                db_ids.append(db_id)
+            season = season or self.query_game_season(session, db_game_id)
+            db_ids = self.upsert_adv_player_stats(session, adv_player_stats, db_game_id, season)
+            self.refresh_player_game_logs(session, [db_game_id], [season])
+            self.commit(session)
         except Exception as e:
             # Rollback in case of exception and raise the error
             session.rollback()
-            raise RuntimeError(f"Error syncing game {game_id}: {str(e)}")
+            raise RuntimeError(f"Error syncing game {db_game_id}: {str(e)}")
         
         return db_ids
     
-    def sync_games(self, season, season_type):
-        games = self.pull_all_games_from_season(season, season_type)
-        for _, game in games.iterrows():
-            time.sleep(0.3)
-            nba_game_id = game['GAME_ID']
-            adv_player_stats, adv_team_stats = self.pull_advanced_stats_for_game(nba_game_id)
-            trad_player_stats, trad_team_stats = self.pull_traditional_stats_for_game(nba_game_id)
-            db_game_id = self.sync_game(game, season, season_type)
-            self.sync_trad_team_stats(trad_team_stats=trad_team_stats, db_game_id=db_game_id)
-            self.sync_adv_team_stats(adv_team_stats=adv_team_stats, db_game_id=db_game_id)
-            self.sync_trad_player_stats(trad_player_stats=trad_player_stats, db_game_id=db_game_id)
-            self.sync_adv_player_stats(adv_player_stats=adv_player_stats, db_game_id=db_game_id)
-            # self.update_all_team_rolling_averages()
+    @transaction_management
+    def sync_game_boxscores(self, session, game, boxscores, season, season_type):
+        """
+        Writes a game row, its four stat tables and its player_game_logs rows in one transaction, so a
+        failure leaves nothing partial behind.
+
+        Args:
+            game (pd.Series): Game row as returned by pull_all_games_from_season.
+            boxscores (dict): Frames as returned by pull_boxscores_for_game.
+            season (str): Season the game belongs to.
+            season_type (str): "Regular Season" or "Playoffs".
+
+        Returns:
+            int: Database id of the game.
+        """
+        try:
+            self.lock_games(session, [game['GAME_ID']])
+            db_game_id = self.upsert_game(session, game, season, season_type, game_summary=boxscores["game_summary"])
+            self.upsert_trad_team_stats(session, boxscores["trad_team_stats"], db_game_id)
+            self.upsert_adv_team_stats(session, boxscores["adv_team_stats"], db_game_id)
+            self.upsert_trad_player_stats(session, boxscores["trad_player_stats"], db_game_id, season)
+            self.upsert_adv_player_stats(session, boxscores["adv_player_stats"], db_game_id, season)
+            self.refresh_player_game_logs(session, [db_game_id], [season])
+            self.commit(session)
+            self.metrics.record_games(1)
+            return db_game_id
+
+        except Exception as e:
+            # Rollback in case of exception and raise the error
+            session.rollback()
+            raise RuntimeError(f"Error syncing game {game['GAME_ID']}: {str(e)}")
+
+    def refresh_player_game_logs(self, session, db_game_ids=None, seasons=None):
+        """
+        Rebuilds the player_game_logs rows of the given games from the stat tables with one
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE. Committing is left to the caller.
+
+        Args:
+            db_game_ids (iterable): Database ids of the games to refresh; None rebuilds every game.
+            seasons (iterable): Seasons the games belong to, so only those stat partitions are scanned.
+        """
+        source = select(
+            TradPlayerStats.player_id, TradPlayerStats.game_id, Game.date, Game.season, Game.season_type,
+            Player.name, Player.position, TradPlayerStats.minutes, TradPlayerStats.pts, TradPlayerStats.reb,
+            TradPlayerStats.ast, AdvPlayerStats.efg_pct, TradPlayerStats.fg3a, TradPlayerStats.fg3m,
+            TradPlayerStats.fg3_pct, TradPlayerStats.fga, TradPlayerStats.fgm, TradPlayerStats.fta,
+            TradPlayerStats.ft_pct, TradPlayerStats.stl, TradPlayerStats.blk,
+        ).select_from(TradPlayerStats)\
+        .join(Game, TradPlayerStats.game_id == Game.id)\
+        .join(Player, TradPlayerStats.player_id == Player.id)\
+        .join(AdvPlayerStats, and_(TradPlayerStats.game_id == AdvPlayerStats.game_id,
+                                   TradPlayerStats.player_id == AdvPlayerStats.player_id,
+                                   TradPlayerStats.season == AdvPlayerStats.season))
+        if seasons is not None:
+            seasons = list(seasons)
+            source = source.where(TradPlayerStats.season.in_(seasons), AdvPlayerStats.season.in_(seasons))
+        if db_game_ids is not None:
+            db_game_ids = [int(db_game_id) for db_game_id in db_game_ids]
+            if not db_game_ids:
+                return 0
+            source = source.where(TradPlayerStats.game_id.in_(db_game_ids))
+
+        columns = ['player_id', 'game_id', 'date', 'season', 'season_type', 'player_name', 'player_position', 'minutes',
+                   'points', 'rebounds', 'assists', 'efg', 'fg3a', 'fg3m', 'fg3_pct', 'fga', 'fgm', 'fta', 'ft_pct',
+                   'steals', 'blocks']
+        insert_statement = insert(PlayerGameLog).from_select(columns, source)
+        upsert_statement = insert_statement.on_conflict_do_update(
+            index_elements=['player_id', 'game_id'],
+            set_={column: insert_statement.excluded[column] for column in columns if column not in ('player_id', 'game_id')}
+        )
+        with self.metrics.timed("game_log_refresh"):
+            n_rows = session.execute(upsert_statement).rowcount
+        self.metrics.record_rows(PlayerGameLog.__tablename__, n_rows)
+        self.touch_games(session, db_game_ids)
+        if db_game_ids is None:
+            self.game_log_cache.clear()
+        else:
+            self.invalidate_game_logs(session, db_game_ids)
+        return n_rows
+
+    @staticmethod
+    def touch_games(session, db_game_ids=None):
+        """Sets games.updated_at of the given games, or of every game if None, for check_game_log_watermarks."""
+        statement = update(Game).values(updated_at=func.now())
+        if db_game_ids is not None:
+            statement = statement.where(Game.id.in_([int(db_game_id) for db_game_id in db_game_ids]))
+        session.execute(statement)
+
+    def invalidate_game_logs(self, session, db_game_ids):
+        """Drops the cached game logs of every player and team in the given games, which this process just rewrote."""
+        player_ids = session.execute(
+            select(TradPlayerStats.player_id).where(TradPlayerStats.game_id.in_(db_game_ids)).distinct()
+        ).scalars().all()
+        team_ids = set()
+        for home_team_id, away_team_id in session.execute(select(Game.home_team_id, Game.away_team_id).where(Game.id.in_(db_game_ids))):
+            team_ids.update((home_team_id, away_team_id))
+        self.game_log_cache.invalidate("player", player_ids)
+        self.game_log_cache.invalidate("team", team_ids)
+
+    @session_management
+    def check_game_log_watermarks(self, session):
+        """
+        Drops cached game logs of players and teams whose games were written by another process.
+
+        Writes that change what a game log reads call touch_games to set games.updated_at: upserts of
+        games, their stats and game log rows (including live polling and stat corrections), and player
+        or team renames in sync_all_player_records and sync_all_team_records. A write that skips
+        touch_games is only seen by its own process. Games updated since the last check, less
+        GAME_LOG_WATERMARK_OVERLAP, name the players and teams to drop. This runs at most once every
+        GAME_LOG_WATERMARK_INTERVAL seconds, so cache hits in between cost no round trip.
+        """
+        now = time.monotonic()
+        if self.watermarks_checked_at is not None and now - self.watermarks_checked_at < self.GAME_LOG_WATERMARK_INTERVAL:
+            return
+        # Database time, so clocks of other hosts don't matter
+        watermark = session.execute(select(func.now())).scalar()
+        since = (self.game_log_watermark or watermark) - timedelta(seconds=self.GAME_LOG_WATERMARK_OVERLAP)
+        versions = dict(session.execute(select(Game.id, Game.updated_at).where(Game.updated_at > since)).all())
+        if self.game_log_watermark is not None:
+            # Games seen by the last check with the same updated_at fall in the overlap but haven't changed
+            db_game_ids = [db_game_id for db_game_id, updated_at in versions.items() if self.game_log_versions.get(db_game_id) != updated_at]
+            if db_game_ids:
+                self.invalidate_game_logs(session, db_game_ids)
+        self.game_log_versions = versions
+        self.game_log_watermark = watermark
+        self.watermarks_checked_at = now
+
+    def cached_game_logs(self, kind, entity_ids, window, read):
+        """
+        Serves the game logs of many players or teams from game_log_cache, reading only the ones
+        that aren't cached.
+
+        Args:
+            kind (str): "player" or "team".
+            entity_ids (list): Database ids, in the order they are returned.
+            window (tuple): Columns, last_n and filters of the read, part of the cache key.
+            read (callable): Takes a list of ids and returns their logs as one frame with a
+                "<kind>_id" column.
+        """
+        self.check_game_log_watermarks()
+        frames = {}
+        missing = []
+        for entity_id in entity_ids:
+            df = self.game_log_cache.get((kind, entity_id) + window)
+            if df is None:
+                missing.append(entity_id)
+            else:
+                frames[entity_id] = df
+        if missing or not entity_ids:
+            fetched = read(missing)
+            groups = dict(list(fetched.groupby(f"{kind}_id", sort=False)))
+            for entity_id in missing:
+                df = groups.get(entity_id, fetched.iloc[0:0]).reset_index(drop=True)
+                self.game_log_cache.put((kind, entity_id) + window, df)
+                frames[entity_id] = df
+            if len(missing) == len(entity_ids):
+                return fetched
+        return pd.concat([frames[entity_id] for entity_id in entity_ids], ignore_index=True)
+
+    @staticmethod
+    def resolve_ids(keys, name_map):
+        """Sorted database ids of a mix of names and ids. Raises KeyError listing any names missing from name_map."""
+        unknown = [key for key in keys if isinstance(key, str) and key not in name_map]
+        if unknown:
+            raise KeyError(f"Unknown names: {unknown}")
+        ids = {name_map[key] for key in keys if isinstance(key, str)}
+        ids.update(int(key) for key in keys if not isinstance(key, str))
+        return sorted(ids)
+
+    @transaction_management
+    def sync_player_game_logs(self, session, db_game_ids=None, seasons=None):
+        try:
+            n_rows = self.refresh_player_game_logs(session, db_game_ids, seasons)
+            self.commit(session)
+            return n_rows
+        except Exception as e:
+            session.rollback()
+            raise RuntimeError(f"Error refreshing player game logs: {str(e)}")
+
+    @staticmethod
+    def missing_partitions(session, season):
+        """Returns {partition name: parent table name} for the season's partitions, and the default ones, that don't exist yet."""
+        suffix = season.replace("-", "_")
+        partitions = {}
+        for model in SEASON_PARTITIONED_MODELS:
+            partitions[f"{model.__tablename__}_{suffix}"] = model.__tablename__
+            partitions[f"{model.__tablename__}_default"] = model.__tablename__
+        existing = set(session.execute(
+            text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = ANY(CAST(:parents AS regclass[]))"),
+            {"parents": [model.__tablename__ for model in SEASON_PARTITIONED_MODELS]},
+        ).scalars())
+        return {name: table_name for name, table_name in partitions.items() if name not in existing}
+
+    @staticmethod
+    def ensure_season_partitions(session, season):
+        """
+        Creates the season's partition of every season-partitioned table, plus a default partition
+        for anything else, if they don't exist yet. Committing is left to the caller.
+
+        Existing partitions are looked up in pg_inherits first, so the usual call issues no DDL and
+        takes no lock on the parent tables. Creation is serialized with a transaction-scoped advisory
+        lock, since CREATE TABLE IF NOT EXISTS can still fail when two sessions run it at once.
+
+        Rows of the season already sitting in the default partition would make CREATE TABLE ...
+        PARTITION OF fail, so they are moved into the new partition before it is attached.
+
+        Returns:
+            list: Names of the partitions created; empty if they all existed.
+        """
+        if not re.fullmatch(r"\d{4}-\d{2}", season):
+            raise ValueError(f"Expected a season like '2023-24', got {season!r}")
+        if not DataManager.missing_partitions(session, season):
+            return []
+        session.execute(text("SELECT pg_advisory_xact_lock(:namespace, 0)"), {"namespace": DataManager.PARTITION_LOCK_NAMESPACE})
+        # Another session may have created them while this one waited for the lock
+        missing = DataManager.missing_partitions(session, season)
+        for name, table_name in missing.items():
+            default_name = f"{table_name}_default"
+            if name == default_name:
+                session.execute(text(f"CREATE TABLE {name} PARTITION OF {table_name} DEFAULT"))
+            elif default_name not in missing and session.execute(
+                    text(f"SELECT EXISTS (SELECT 1 FROM {default_name} WHERE season = :season)"), {"season": season}).scalar():
+                session.execute(text(f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+                session.execute(text(
+                    f"WITH moved AS (DELETE FROM {default_name} WHERE season = :season RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+                ), {"season": season})
+                session.execute(text(f"ALTER TABLE {table_name} ATTACH PARTITION {name} FOR VALUES IN ('{season}')"))
+            else:
+                session.execute(text(f"CREATE TABLE {name} PARTITION OF {table_name} FOR VALUES IN ('{season}')"))
+        return list(missing)
+
+    def require_season_partitions(self, session, season):
+        """ensure_season_partitions, remembering seasons whose partitions were already there so later writes skip the lookup."""
+        if season in self.partitioned_seasons:
+            return
+        if not self.ensure_season_partitions(session, season):
+            # Only seasons found already created are remembered; new ones may still be rolled back
+            self.partitioned_seasons.add(season)
+
+    @transaction_management
+    def create_season_partitions(self, session, season):
+        self.ensure_season_partitions(session, season)
+        session.commit()
+
+    @session_management
+    def query_synced_games(self, session, season, season_type):
+        # The season filter on the stat table lets Postgres scan only that season's partition
+        has_stats = exists().where(TradPlayerStats.game_id == Game.id, TradPlayerStats.season == season)
+        rows = session.query(Game.nba_game_id, Game.game_status_text, has_stats.label('has_stats'))\
+            .filter(Game.season == season, Game.season_type == season_type).all()
+        return {nba_game_id: (game_status_text, has_stats) for nba_game_id, game_status_text, has_stats in rows}
+
+    @staticmethod
+    def is_final(game_status_text):
+        return bool(game_status_text) and game_status_text.startswith("Final")
+
+    def select_games_to_sync(self, games, season, season_type, stale_game_ids=None):
+        """
+        Drops games that are already stored as Final with their stat rows, unless flagged as stale.
+
+        Args:
+            games (pd.DataFrame): Games as returned by pull_all_games_from_season.
+            season (str): Season the games belong to.
+            season_type (str): "Regular Season" or "Playoffs".
+            stale_game_ids (iterable): nba game ids to re-fetch regardless of their stored status.
+
+        Returns:
+            pd.DataFrame: The subset of games that still needs boxscores.
+        """
+        synced = self.query_synced_games(season, season_type)
+        stale = {int(nba_game_id) for nba_game_id in stale_game_ids or []}
+
+        def needs_sync(nba_game_id):
+            nba_game_id = int(nba_game_id)
+            if nba_game_id in stale or nba_game_id not in synced:
+                return True
+            game_status_text, has_stats = synced[nba_game_id]
+            return not (self.is_final(game_status_text) and has_stats)
+
+        return games[games['GAME_ID'].map(needs_sync).astype(bool)]
+
+    def sync_games(self, season, season_type, max_workers=4, requests_per_second=None, incremental=False, stale_game_ids=None, date_from=None, date_to=None,
+                   resume=False, max_attempts=5, retry_backoff=30, retry_failed=False):
+        """
+        Fetches boxscores for every game of a season on a worker pool and upserts them as they arrive.
+
+        Args:
+            season (str): Season to sync, e.g. "2023-24".
+            season_type (str): "Regular Season" or "Playoffs".
+            max_workers (int): Number of threads fetching from nba_api at once.
+            requests_per_second (float): Overrides the process-wide nba_api request budget if given.
+            incremental (bool): Only fetch games that are new, not yet Final, or listed in stale_game_ids.
+            stale_game_ids (iterable): nba game ids to re-fetch in incremental mode even if already Final.
+            date_from (date or str): Only discover games on or after this date, e.g. date_mng.get_date_n_days_ago(2).
+            date_to (date or str): Only discover games on or before this date.
+            resume (bool): Record progress in the sync journal, skip games an earlier run already ingested and
+                retry failed games with backoff instead of stopping at the first error.
+            max_attempts (int): In resume mode, failures after which a game is no longer retried.
+            retry_backoff (float): In resume mode, seconds before the first retry round; doubles each round.
+            retry_failed (bool): In resume mode, retry games that used up max_attempts in earlier runs.
+
+        Raises:
+            RuntimeError: In resume mode, if some games still failed after every attempt.
+        """
+        if requests_per_second is not None:
+            nba_api_limiter.set_rate(requests_per_second)
+        self.metrics = IngestMetrics(f"sync_games {season} {season_type}")
+        try:
+            self.create_season_partitions(season)
+            games = self.pull_all_games_from_season(season, season_type, date_from, date_to)
+            if games.empty:
+                print("No games found.")
+                return
+            if incremental:
+                total = len(games)
+                games = self.select_games_to_sync(games, season, season_type, stale_game_ids)
+                print(f"Incremental sync: {len(games)} of {total} games need boxscores.")
+            if resume:
+                def write_batch(batch):
+                    for game, boxscores in batch:
+                        self.sync_game_boxscores(game, boxscores, season, season_type)
+                run_journaled(self, games, season, season_type, write_batch, max_workers=max_workers,
+                              max_attempts=max_attempts, retry_backoff=retry_backoff, retry_failed=retry_failed)
+                return
+            for i, (game, boxscores) in enumerate(self.fetch_boxscores(games, max_workers)):
+                self.sync_game_boxscores(game, boxscores, season, season_type)
+                print(f"Synced game {game['GAME_ID']} ({i + 1}/{len(games)})")
+                # self.update_all_team_rolling_averages()
+        finally:
+            self.finish_ingest_run()
+
+    def finish_ingest_run(self):
+        """Prints the current run's metrics and stores them in ingest_runs, so slow runs can be compared with earlier ones."""
+        summary = self.metrics.print_summary()
+        try:
+            self.save_ingest_run(summary)
+        except Exception as e:
+            # Losing a run summary should never fail the ingest itself
+            print(f"Could not save ingest run summary: {e}")
+
+    @transaction_management
+    def save_ingest_run(self, session, summary):
+        session.add(IngestRun(
+            name=summary["name"],
+            started_at=self.metrics.started_at,
+            elapsed=summary["elapsed"],
+            games=summary["games"],
+            games_per_minute=summary["games_per_minute"],
+            commits=summary["commits"],
+            summary=summary,
+        ))
+        session.commit()
+
+    def fetch_boxscores(self, games, max_workers=4, raise_errors=True):
+        """
+        Fetches boxscores for many games on a worker pool.
+
+        Args:
+            games (pd.DataFrame): Games as returned by pull_all_games_from_season.
+            max_workers (int): Number of threads fetching from nba_api at once.
+            raise_errors (bool): Raise the first failed fetch; if False, yield the exception in place of the boxscores.
+
+        Yields:
+            tuple: (game row, boxscores dict from pull_boxscores_for_game), in the order fetches finish.
+        """
+        fetched = queue.Queue()
+        pending = (game for _, game in games.iterrows())
+
+        def fetch(game):
+            try:
+                fetched.put((game, self.pull_boxscores_for_game(game['GAME_ID'])))
+            except Exception as e:
+                fetched.put((game, e))
+
+        def submit_next():
+            game = next(pending, None)
+            if game is not None:
+                executor.submit(fetch, game)
+
+        # Network calls run on the pool while the caller drains the queue into the database. At most
+        # 2 * max_workers games are fetched ahead of the caller, so a slow writer holds back the fetches
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for _ in range(2 * max_workers):
+                submit_next()
+            for _ in range(len(games)):
+                game, boxscores = fetched.get()
+                submit_next()
+                if raise_errors and isinstance(boxscores, Exception):
+                    raise boxscores
+                yield game, boxscores
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
         
     @session_management
     def query_games(self, session):
         return session.query(Game).all()
     
+    @session_management
+    def read_frame(self, session, columns, *filters, joins=(), order_by=(), limit=None):
+        """
+        Reads the given columns into a typed DataFrame with a Core select, skipping ORM hydration.
+
+        Args:
+            columns (list): Columns or labeled expressions to select, e.g. [Player.name, Game.date.label('game_date')].
+            *filters: WHERE clauses.
+            joins (list): (target, onclause) pairs joined onto the first selected table, in order.
+            order_by (list): ORDER BY clauses.
+            limit (int): Maximum number of rows.
+
+        Returns:
+            pd.DataFrame: See query_frames.read_frame for the dtypes.
+        """
+        statement = select(*columns)
+        for target, onclause in joins:
+            statement = statement.join(target, onclause)
+        statement = statement.where(*filters).order_by(*order_by)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return read_frame(session, statement)
+
     @session_management
     def query_advanced_player_stats(self, session):
         return session.query(AdvPlayerStats).all()
+
+    def read_advanced_player_stats(self, *filters):
+        # Typed DataFrame of query_advanced_player_stats without the ORM objects
+        return self.read_frame(list(AdvPlayerStats.__table__.columns), *filters)
     
     @staticmethod
     def convert_to_df(query_result, exclude_columns=['_sa_instance_state']):
+        # Kept for notebooks holding ORM results; new reads should use read_frame
         if not query_result:
             return pd.DataFrame()
         data = [{key: value for key, value in vars(obj).items() if key not in exclude_columns} for obj in query_result]
@@ -765,55 +1106,114 @@ class DataManager:
         team_id = team.id
         return team_id
     
-    @session_management
-    def get_and_save_player_data(self, session, player_id, filename=None):
-        data = session.query(
-            Player,
-            TradPlayerStats,
-            AdvPlayerStats,
-            Game
-        ).join(Game, TradPlayerStats.game_id == Game.id)\
-        .join(Player, TradPlayerStats.player_id == Player.id)\
-        .join(AdvPlayerStats, and_(TradPlayerStats.game_id == AdvPlayerStats.game_id, 
-                                    TradPlayerStats.player_id == AdvPlayerStats.player_id))\
-        .filter(
-            (TradPlayerStats.player_id == player_id) #&
-            #(Game.season_type == season_type)
-        ).all()
-
-        # Convert the query result to a DataFrame
-        data_list = []
-        for player, trad_stats, adv_stats, game in data:
-            row = {
-                'player_name': player.name,
-                'player_position': player.position,
-                'minutes': trad_stats.minutes,
-                'points': trad_stats.pts,
-                'rebounds': trad_stats.reb,
-                'assists': trad_stats.ast,
-                'efg': adv_stats.efg_pct,
-                'fg3a': trad_stats.fg3a,
-                'fg3m': trad_stats.fg3m,
-                'fg3_pct': trad_stats.fg3_pct,
-                'fga': trad_stats.fga,
-                'fgm': trad_stats.fgm,
-                'fta': trad_stats.fta,
-                'ft_pct': trad_stats.ft_pct, 
-                'steals': trad_stats.stl,
-                'blocks': trad_stats.blk,
-                'date': game.date,
-                'game_id': game.id
-
-            }
-            data_list.append(row)
-        if not data_list:
+    def get_and_save_player_data(self, player_id, filename=None):
+        # player_id may also be a name, resolved the way query_player_game_logs resolves them
+        player_id, = self.resolve_ids([player_id], self.player_name_map)
+        # One indexed scan of the pre-joined game log instead of joining four tables per call
+        data_df = self.query_player_game_log(player_id, [
+            'player_name', 'player_position', 'minutes', 'points', 'rebounds', 'assists', 'efg', 'fg3a', 'fg3m',
+            'fg3_pct', 'fga', 'fgm', 'fta', 'ft_pct', 'steals', 'blocks', 'date', 'game_id',
+        ])
+
+        if data_df.empty:
             return None
-        data_df = pd.DataFrame(data_list)
-        data_df = data_df.sort_values(by="date", ascending=False)
-        save_destination = player.name if not filename else filename
-        data_df.to_csv(f"data_pile/{save_destination}.csv")
+        if self.export_sink is not None:
+            save_destination = data_df.loc[0, 'player_name'] if not filename else filename
+            self.export_sink.write(save_destination, data_df)
         return data_df
-    
+
+    @staticmethod
+    def window_key(columns, last_n, seasons, season_types):
+        # The arguments of a game log read as a hashable part of its game_log_cache key
+        return tuple(None if value is None else tuple(value) for value in (columns, seasons, season_types)) + (last_n,)
+
+    def query_player_game_log(self, player_id, columns=None, last_n=None, seasons=None, season_types=None):
+        """
+        Reads a player's most recent games, newest first, with the ordering and limit done in SQL.
+
+        The (player_id, date) index on player_game_logs lets Postgres walk the player's games backwards
+        and stop after last_n rows, so the cost doesn't grow with the length of the career. Results are
+        kept in game_log_cache until the player has new games.
+
+        Args:
+            player_id (int): Database id of the player.
+            columns (list): player_game_logs column names to return, e.g. ["points"]; all columns if None.
+            last_n (int): Number of most recent games; every game if None.
+            seasons (list): Only games of these seasons, e.g. ["2023-24"].
+            season_types (list): Only games of these season types, e.g. ["Playoffs"].
+
+        Returns:
+            pd.DataFrame: One row per game.
+        """
+        self.check_game_log_watermarks()
+        key = ("player", int(player_id), "log") + self.window_key(columns, last_n, seasons, season_types)
+        data_df = self.game_log_cache.get(key)
+        if data_df is not None:
+            return data_df
+        selected = list(PlayerGameLog.__table__.columns) if columns is None else [getattr(PlayerGameLog, column) for column in columns]
+        filters = [PlayerGameLog.player_id == player_id]
+        if seasons is not None:
+            filters.append(PlayerGameLog.season.in_(seasons))
+        if season_types is not None:
+            filters.append(PlayerGameLog.season_type.in_(season_types))
+        data_df = self.read_frame(selected, *filters, order_by=[PlayerGameLog.date.desc()], limit=last_n)
+        self.game_log_cache.put(key, data_df)
+        return data_df
+
+    def query_player_game_logs(self, players, columns=None, last_n=None, seasons=None, season_types=None):
+        """
+        Reads the game logs of many players in one query instead of one get_and_save_player_data call each.
+        Players already in game_log_cache with the same arguments are served from there.
+
+        Args:
+            players (list): Player names or database ids.
+            columns (list): player_game_logs column names to return besides player_id and player_name;
+                all columns if None.
+            last_n (int): Most recent games to keep per player; every game if None.
+            seasons (list): Only games of these seasons, e.g. ["2023-24"].
+            season_types (list): Only games of these season types, e.g. ["Playoffs"].
+
+        Returns:
+            pd.DataFrame: One row per player and game, grouped by player, newest game first.
+        """
+        player_ids = self.resolve_ids(players, self.player_name_map)
+        window = ("logs",) + self.window_key(columns, last_n, seasons, season_types)
+        return self.cached_game_logs(
+            "player", player_ids, window,
+            lambda missing_ids: self.read_player_game_logs(missing_ids, columns, last_n, seasons, season_types),
+        )
+
+    @session_management
+    def read_player_game_logs(self, session, player_ids, columns=None, last_n=None, seasons=None, season_types=None):
+        """
+        The query behind query_player_game_logs.
+
+        Each player's games are read by a LATERAL subquery ordered by date and limited to last_n, so
+        Postgres walks the (player_id, date) index backwards once per player and stops after last_n
+        rows. A ROW_NUMBER() window over the same rows would have to sort every game of every player.
+        """
+        if columns is None:
+            selected = list(PlayerGameLog.__table__.columns)
+        else:
+            selected = [PlayerGameLog.player_id, PlayerGameLog.player_name]
+            selected += [getattr(PlayerGameLog, column) for column in columns if column not in ('player_id', 'player_name')]
+        names = [column.name for column in selected]
+        if 'date' not in names:
+            selected.append(PlayerGameLog.date)  # needed for the ordering only
+
+        games = select(*selected).where(PlayerGameLog.player_id == Player.id)
+        if seasons is not None:
+            games = games.where(PlayerGameLog.season.in_(seasons))
+        if season_types is not None:
+            games = games.where(PlayerGameLog.season_type.in_(season_types))
+        games = games.order_by(PlayerGameLog.date.desc()).limit(last_n).lateral()
+
+        statement = select(*[games.c[name] for name in names])\
+            .select_from(Player).join(games, true())\
+            .where(Player.id.in_(player_ids))\
+            .order_by(games.c.player_id, games.c.date.desc())
+        return read_frame(session, statement)
+
     @staticmethod
     def extract_raw_data(file_path): # .csv
     # gets input from A1
@@ -882,6 +1282,9 @@ class DataManager:
     def get_analyzed_props(self):
 
         available_props = self.load_available_props()
+        # Recent games of every player on the slate in one query, handed to each Prop
+        game_logs = self.query_player_game_logs(list(available_props["player_name"].unique()), last_n=Prop.LAST_N_GAMES)
+        game_logs = dict(list(game_logs.groupby("player_name", sort=False)))
         props = []
         for _, row in available_props.iterrows():
             print(row)
@@ -892,7 +1295,9 @@ class DataManager:
                         stat=row["stat"], 
                     threshold=row[f"{bet_type}_threshold"], 
                         odds=row[f"{bet_type}_odds"], 
-                    bet_type=bet_type
+                    bet_type=bet_type,
+                    game_log=game_logs.get(row["player_name"], pd.DataFrame(columns=[row["stat"]])),
+                    data_manager=self,
                     )
                 props.append(prop)    
                 print("Prop object created.")
@@ -1060,56 +1465,101 @@ class DataManager:
     #     filtered_df.to_csv(f"props_{date.today()}.csv")
     #     return filtered_df
     
-    @session_management
-    def get_and_save_team_data(self, session, team_id, filename=None):
-        data = session.query(
-            Team,
-            TradTeamStats,
-            AdvTeamStats,
-            Game
-        ).join(Game, TradTeamStats.game_id == Game.id)\
-        .join(Team, TradTeamStats.team_id == Team.id)\
-        .join(AdvTeamStats, and_(TradTeamStats.game_id == AdvTeamStats.game_id, 
-                                    TradTeamStats.team_id == AdvTeamStats.team_id))\
-        .filter(
-            (TradTeamStats.team_id == team_id)
-            #(Game.season_type == season_type)
-        ).all()
-
-        # Convert the query result to a DataFrame
-        data_list = []
-        for team, trad_stats, adv_stats, game in data:
-            row = {
-                'team_name': team.full_name,
-                'points': trad_stats.pts,
-                'rebounds': trad_stats.reb,
-                'assists': trad_stats.ast,
-                'efg': adv_stats.efg_pct,
-                'fg3a': trad_stats.fg3a,
-                'fg3m': trad_stats.fg3m,
-                'fg3_pct': trad_stats.fg3_pct,
-                'fga': trad_stats.fga,
-                'fgm': trad_stats.fgm,
-                'fta': trad_stats.fta,
-                'ft_pct': trad_stats.ft_pct, 
-                'steals': trad_stats.stl,
-                'blocks': trad_stats.blk,
-                'to': trad_stats.to, 
-                'date': game.date,
-                'game_id': game.id,
-                'pace' : adv_stats.pace,
-                'def_rating': adv_stats.def_rating,
-                'e_def_rating': adv_stats.e_def_rating,
-                'off_rating': adv_stats.off_rating,
-                'e_off_rating': adv_stats.e_off_rating,
-            }
-            data_list.append(row)
-
-        data_df = pd.DataFrame(data_list)
-        data_df = data_df.sort_values(by="date", ascending=False)
-        save_destination = team.nickname if not filename else filename
-        data_df.to_csv(f"data_pile/{save_destination}.csv")
+    @staticmethod
+    def team_game_log_columns():
+        """
+        Returns:
+            tuple: (columns, joins) of the team game log read by get_and_save_team_data and
+                query_team_game_logs, for read_frame.
+        """
+        columns = [
+            Team.full_name.label('team_name'),
+            TradTeamStats.pts.label('points'),
+            TradTeamStats.reb.label('rebounds'),
+            TradTeamStats.ast.label('assists'),
+            AdvTeamStats.efg_pct.label('efg'),
+            TradTeamStats.fg3a,
+            TradTeamStats.fg3m,
+            TradTeamStats.fg3_pct,
+            TradTeamStats.fga,
+            TradTeamStats.fgm,
+            TradTeamStats.fta,
+            TradTeamStats.ft_pct,
+            TradTeamStats.stl.label('steals'),
+            TradTeamStats.blk.label('blocks'),
+            TradTeamStats.to,
+            Game.date,
+            Game.id.label('game_id'),
+            AdvTeamStats.pace,
+            AdvTeamStats.def_rating,
+            AdvTeamStats.e_def_rating,
+            AdvTeamStats.off_rating,
+            AdvTeamStats.e_off_rating,
+        ]
+        joins = [
+            (TradTeamStats, TradTeamStats.team_id == Team.id),
+            (Game, TradTeamStats.game_id == Game.id),
+            (AdvTeamStats, and_(TradTeamStats.game_id == AdvTeamStats.game_id,
+                                TradTeamStats.team_id == AdvTeamStats.team_id)),
+        ]
+        return columns, joins
+
+    def get_and_save_team_data(self, team_id, filename=None):
+        # team_id may also be a nickname, resolved the way query_team_game_logs resolves them
+        team_id, = self.resolve_ids([team_id], self.team_nickname_map)
+        data_df = self.query_team_game_logs([team_id]).drop(columns='team_id')
+
+        if data_df.empty:
+            return None
+        if self.export_sink is not None:
+            save_destination = self.team_id_nickname_map[team_id] if not filename else filename
+            self.export_sink.write(save_destination, data_df)
         return data_df
+
+    def query_team_game_logs(self, teams, last_n=None, seasons=None, season_types=None):
+        """
+        Reads the game logs of many teams in one query instead of one get_and_save_team_data call each.
+        Teams already in game_log_cache with the same arguments are served from there.
+
+        Args:
+            teams (list): Team nicknames or database ids.
+            last_n (int): Most recent games to keep per team; every game if None.
+            seasons (list): Only games of these seasons, e.g. ["2023-24"].
+            season_types (list): Only games of these season types, e.g. ["Playoffs"].
+
+        Returns:
+            pd.DataFrame: The get_and_save_team_data columns plus team_id, newest game first per team.
+        """
+        team_ids = self.resolve_ids(teams, self.team_nickname_map)
+        window = ("logs",) + self.window_key(None, last_n, seasons, season_types)
+        return self.cached_game_logs(
+            "team", team_ids, window,
+            lambda missing_ids: self.read_team_game_logs(missing_ids, last_n, seasons, season_types),
+        )
+
+    @session_management
+    def read_team_game_logs(self, session, team_ids, last_n=None, seasons=None, season_types=None):
+        """The query behind query_team_game_logs."""
+        columns, joins = self.team_game_log_columns()
+        statement = select(TradTeamStats.team_id, *columns)
+        for target, onclause in joins:
+            statement = statement.join(target, onclause)
+        statement = statement.where(TradTeamStats.team_id.in_(team_ids))
+        if seasons is not None:
+            statement = statement.where(Game.season.in_(seasons))
+        if season_types is not None:
+            statement = statement.where(Game.season_type.in_(season_types))
+        if last_n is None:
+            return read_frame(session, statement.order_by(TradTeamStats.team_id, Game.date.desc()))
+
+        # Team logs join four tables, so no index returns them in date order; ROW_NUMBER() numbers
+        # each team's games instead, newest first
+        game_number = func.row_number().over(partition_by=TradTeamStats.team_id, order_by=Game.date.desc()).label('game_number')
+        games = statement.add_columns(game_number).subquery()
+        statement = select(*[column for column in games.c if column.name != 'game_number'])\
+            .where(games.c.game_number <= last_n)\
+            .order_by(games.c.team_id, games.c.game_number)
+        return read_frame(session, statement)
     
     @staticmethod
     def create_pivot_table_for_tracking(df):
@@ -1119,64 +1569,65 @@ class DataManager:
         pivot_df = pivot_df.reset_index()
         return pivot_df
     
-    @session_management
-    def get_all_team_stats(self, session):
-        query = session.query(
-            Game.id.label('game_id'),
-            Game.date,
-            TradTeamStats.team_id,
-            Team.full_name.label('team_name'),
-            TradTeamStats.minutes.label('trad_minutes'),
-            TradTeamStats.fgm,
-            TradTeamStats.fga,
-            TradTeamStats.fg_pct,
-            TradTeamStats.fg3m,
-            TradTeamStats.fg3a,
-            TradTeamStats.fg3_pct,
-            TradTeamStats.ftm,
-            TradTeamStats.fta,
-            TradTeamStats.ft_pct,
-            TradTeamStats.oreb,
-            TradTeamStats.dreb,
-            TradTeamStats.reb,
-            TradTeamStats.ast,
-            TradTeamStats.stl,
-            TradTeamStats.blk,
-            TradTeamStats.to,
-            TradTeamStats.pf,
-            TradTeamStats.pts,
-            TradTeamStats.plus_minus,
-            AdvTeamStats.minutes.label('adv_minutes'),
-            AdvTeamStats.e_off_rating,
-            AdvTeamStats.off_rating,
-            AdvTeamStats.e_def_rating,
-            AdvTeamStats.def_rating,
-            AdvTeamStats.e_net_rating,
-            AdvTeamStats.net_rating,
-            AdvTeamStats.ast_pct,
-            AdvTeamStats.ast_tov,
-            AdvTeamStats.ast_ratio,
-            AdvTeamStats.oreb_pct,
-            AdvTeamStats.dreb_pct,
-            AdvTeamStats.reb_pct,
-            AdvTeamStats.e_tm_tov_pct,
-            AdvTeamStats.tm_tov_pct,
-            AdvTeamStats.efg_pct,
-            AdvTeamStats.ts_pct,
-            AdvTeamStats.usg_pct,
-            AdvTeamStats.e_usg_pct,
-            AdvTeamStats.e_pace,
-            AdvTeamStats.pace,
-            AdvTeamStats.pace_per40,
-            AdvTeamStats.poss,
-            AdvTeamStats.pie
-        ).join(TradTeamStats, Game.id == TradTeamStats.game_id
-        ).join(AdvTeamStats, (Game.id == AdvTeamStats.game_id) & (TradTeamStats.team_id == AdvTeamStats.team_id)
-        ).join(Team, TradTeamStats.team_id == Team.id)
-
-        df = pd.read_sql(query.statement, query.session.bind).sort_values(by=date, ascending=False)
-        
-        return df
+    def get_all_team_stats(self):
+        return self.read_frame(
+            [
+                Game.id.label('game_id'),
+                Game.date,
+                TradTeamStats.team_id,
+                Team.full_name.label('team_name'),
+                TradTeamStats.minutes.label('trad_minutes'),
+                TradTeamStats.fgm,
+                TradTeamStats.fga,
+                TradTeamStats.fg_pct,
+                TradTeamStats.fg3m,
+                TradTeamStats.fg3a,
+                TradTeamStats.fg3_pct,
+                TradTeamStats.ftm,
+                TradTeamStats.fta,
+                TradTeamStats.ft_pct,
+                TradTeamStats.oreb,
+                TradTeamStats.dreb,
+                TradTeamStats.reb,
+                TradTeamStats.ast,
+                TradTeamStats.stl,
+                TradTeamStats.blk,
+                TradTeamStats.to,
+                TradTeamStats.pf,
+                TradTeamStats.pts,
+                TradTeamStats.plus_minus,
+                AdvTeamStats.minutes.label('adv_minutes'),
+                AdvTeamStats.e_off_rating,
+                AdvTeamStats.off_rating,
+                AdvTeamStats.e_def_rating,
+                AdvTeamStats.def_rating,
+                AdvTeamStats.e_net_rating,
+                AdvTeamStats.net_rating,
+                AdvTeamStats.ast_pct,
+                AdvTeamStats.ast_tov,
+                AdvTeamStats.ast_ratio,
+                AdvTeamStats.oreb_pct,
+                AdvTeamStats.dreb_pct,
+                AdvTeamStats.reb_pct,
+                AdvTeamStats.e_tm_tov_pct,
+                AdvTeamStats.tm_tov_pct,
+                AdvTeamStats.efg_pct,
+                AdvTeamStats.ts_pct,
+                AdvTeamStats.usg_pct,
+                AdvTeamStats.e_usg_pct,
+                AdvTeamStats.e_pace,
+                AdvTeamStats.pace,
+                AdvTeamStats.pace_per40,
+                AdvTeamStats.poss,
+                AdvTeamStats.pie,
+            ],
+            joins=[
+                (TradTeamStats, Game.id == TradTeamStats.game_id),
+                (AdvTeamStats, (Game.id == AdvTeamStats.game_id) & (TradTeamStats.team_id == AdvTeamStats.team_id)),
+                (Team, TradTeamStats.team_id == Team.id),
+            ],
+            order_by=[Game.date.desc()],
+        )
 
     @staticmethod
     def get_team_averages(df):
@@ -1226,7 +1677,7 @@ class DataManager:
             df.to_excel(writer, sheet_name=tag)
         writer.close()
 
-    @session_management
+    @transaction_management
     def upsert_team_rolling_averages(self, session, record):
         insert_stmt = insert(TeamRollingAverages).values(
         points = record['points'],
@@ -1282,13 +1733,14 @@ class DataManager:
         )
 
         session.execute(update_stmt)
-        session.commit()
+        self.commit(session)
 
     def update_all_team_rolling_averages(self, average_method="median", window_size=10):
         teams = self.query_teams()
         team_ids = [team.id for team in teams]
-        for team_id in team_ids:
-            team_data = self.get_and_save_team_data(team_id)
+        # Every team's games in one query rather than one get_and_save_team_data call per team
+        team_game_logs = self.query_team_game_logs(team_ids)
+        for team_id, team_data in team_game_logs.groupby('team_id', sort=False):
             features = team_data.sort_values(by='date', ascending=True)
             feature_columns = ['points', 'rebounds', 'assists', 'efg', 'fg3a', 'fg3m', 'fg3_pct', 'fga', 'fgm', 'fta', 
                             'ft_pct', 'steals', 'blocks', 'to', 'pace', 'def_rating', 'e_def_rating', 'off_rating', 'e_off_rating']
@@ -1297,7 +1749,8 @@ class DataManager:
                 rolling_averages = stats.shift(1).rolling(window=window_size).median()
             elif average_method == "mean":
                 rolling_averages = stats.shift(1).rolling(window=window_size).mean()
-            rolling_averages['date'] = features['date']
+            # team_rolling_averages.date is a string column holding dates as YYYY-MM-DD
+            rolling_averages['date'] = features['date'].dt.strftime('%Y-%m-%d')
             rolling_averages['game_id'] = features['game_id']
             rolling_averages['team_id'] = team_id
             rolling_averages = rolling_averages.dropna()
@@ -1496,13 +1949,21 @@ class DataManager:
         return parlay_distribution
 
 class Prop:
-    def __init__(self, name, team, stat, threshold, odds, bet_type):
+    LAST_N_GAMES = 25
+    shared_dm = None  # DataManager reused by every Prop created without one
+
+    def __init__(self, name, team, stat, threshold, odds, bet_type, game_log=None, data_manager=None):
         self.name = name
         self.team = team
         self.stat = stat
         self.n = threshold
         self.odds = odds
         self.bet_type = bet_type
+        # Recent games from DataManager.query_player_game_logs, newest first; queried per prop if None
+        self.game_log = game_log
+        # Only used without a game_log; falls back to one DataManager shared by all props so
+        # props queried one by one still reuse the same engine and game_log_cache
+        self.dm = data_manager
         self.probability = self.get_prop_probability()
         self.ev, self.house_prob = self.get_ev_and_implied_prob()
         self.print_out = f"""
@@ -1528,10 +1989,16 @@ class Prop:
         "HOUSE_PROB": self.house_prob
         }
     
-    def get_prop_probability(self, last_n_games=25):
-        dm = DataManager()
-        player_id = dm.get_player_id(self.name)
-        data = dm.get_and_save_player_data(player_id, self.name).sort_values(by='date', ascending=False).head(last_n_games).copy()
+    def get_prop_probability(self, last_n_games=LAST_N_GAMES, seasons=None, season_types=None):
+        if self.game_log is not None:
+            if seasons is not None or season_types is not None:
+                # The log was fetched as the player's latest games overall, so filtering it would leave fewer than last_n_games
+                raise ValueError("seasons and season_types can't be applied to a pre-fetched game_log; query without one instead.")
+            data = self.game_log.head(last_n_games)
+        else:
+            dm = self.dm or self.get_shared_data_manager()
+            player_id, = dm.resolve_ids([self.name], dm.player_name_map)
+            data = dm.query_player_game_log(player_id, [self.stat], last_n=last_n_games, seasons=seasons, season_types=season_types)
         # print(data.head())
         if self.bet_type == "over":
             return analyze.estimate_probability_poisson_over(data, self.stat, self.n)
@@ -1540,6 +2007,12 @@ class Prop:
         else:
             raise ValueError("Invalid bet type. Use 'over' or 'under'.")
         
+    @classmethod
+    def get_shared_data_manager(cls):
+        if cls.shared_dm is None:
+            cls.shared_dm = DataManager()
+        return cls.shared_dm
+
     def get_ev_and_implied_prob(self):
         odds = self.american_to_decimal(self.odds)
         house_probability = analyze.estimate_implied_probability(odds)
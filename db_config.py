@@ -1,16 +1,57 @@
+import os
+import threading
 import configparser
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-def get_database_engine():
+# Pool settings used when config.ini's [database] section doesn't override them
+POOL_DEFAULTS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+# One engine and sessionmaker per process, created on first use
+_engine = None
+_session_factory = None
+_engine_pid = None
+_engine_lock = threading.Lock()
+
+
+def read_database_config():
     config = configparser.ConfigParser()
     config.read('config.ini')
-    database_url = config['database']['url']
-    engine = create_engine(database_url)
-    return engine
+    database = config['database']
+    pool_options = {
+        "pool_size": database.getint("pool_size", POOL_DEFAULTS["pool_size"]),
+        "max_overflow": database.getint("max_overflow", POOL_DEFAULTS["max_overflow"]),
+        "pool_pre_ping": database.getboolean("pool_pre_ping", POOL_DEFAULTS["pool_pre_ping"]),
+        "pool_recycle": database.getint("pool_recycle", POOL_DEFAULTS["pool_recycle"]),
+    }
+    return database['url'], pool_options
+
+
+def get_database_engine():
+    """
+    Returns this process's engine, creating it and its connection pool on the first call.
+
+    A process forked from one that already had an engine (e.g. a backfill worker) gets its own,
+    since pooled connections can't be shared across processes.
+    """
+    global _engine, _session_factory, _engine_pid
+    with _engine_lock:
+        if _engine is None or _engine_pid != os.getpid():
+            if _engine is not None:
+                # Drop the parent's pooled connections without closing them under the parent
+                _engine.dispose(close=False)
+            database_url, pool_options = read_database_config()
+            _engine = create_engine(database_url, **pool_options)
+            _session_factory = sessionmaker(_engine)
+            _engine_pid = os.getpid()
+        return _engine
+
 
 def get_session():
-    engine = get_database_engine()
-    Session = sessionmaker(engine)
-    session = Session()
-    return session
+    get_database_engine()
+    return _session_factory()
@@ -0,0 +1,111 @@
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExportSink:
+    """
+    Saves DataFrames to <directory>/<name>.<file_format> away from the read path.
+
+    Frames handed to write() are held until flush() (the latest frame per name wins), or with
+    background=True written by a worker thread as they arrive. A file whose bytes would not change
+    is left alone. Parquet needs pyarrow (or fastparquet) installed.
+
+        with ExportSink("data_pile", file_format="parquet") as sink:
+            dm = DataManager(export_sink=sink)
+            ...
+    """
+
+    FILE_FORMATS = ("csv", "parquet")
+
+    def __init__(self, directory="data_pile", file_format="csv", background=False):
+        if file_format not in self.FILE_FORMATS:
+            raise ValueError(f"Unknown file format {file_format!r}, expected one of {self.FILE_FORMATS}.")
+        self.directory = directory
+        self.file_format = file_format
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=1) if background else None
+        self.futures = []
+        self.written = 0
+        self.skipped = 0
+
+    def write(self, name, df):
+        # Copied so the caller can keep changing its frame while this one waits to be written
+        df = df.copy()
+        with self.lock:
+            if self.executor is not None:
+                self.futures.append(self.executor.submit(self.export, name, df))
+            else:
+                self.pending[name] = df
+
+    def serialize(self, df):
+        if self.file_format == "parquet":
+            return df.to_parquet()
+        buffer = io.StringIO()
+        df.to_csv(buffer)
+        return buffer.getvalue().encode("utf-8")
+
+    def export(self, name, df):
+        """
+        Writes one frame unless the file already holds the same bytes.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        content = self.serialize(df)
+        path = os.path.join(self.directory, f"{name}.{self.file_format}")
+        try:
+            if os.path.getsize(path) == len(content):
+                with open(path, "rb") as f:
+                    unchanged = f.read() == content
+            else:
+                unchanged = False
+        except FileNotFoundError:
+            unchanged = False
+
+        if unchanged:
+            written = False
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temp file and swap it in so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            written = True
+        with self.lock:
+            if written:
+                self.written += 1
+            else:
+                self.skipped += 1
+        return written
+
+    def flush(self):
+        """
+        Writes every held frame and waits for the background writes.
+
+        Returns:
+            tuple: (files written, unchanged files skipped) since the sink was created.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            futures, self.futures = self.futures, []
+        for name, df in pending.items():
+            self.export(name, df)
+        for future in futures:
+            future.result()
+        return self.written, self.skipped
+
+    def close(self):
+        self.flush()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
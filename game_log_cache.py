@@ -0,0 +1,58 @@
+import threading
+from collections import OrderedDict
+
+
+class GameLogCache:
+    """
+    Least recently used cache of game log DataFrames, bounded by their total memory.
+
+    Keys are tuples starting with the kind of log and the entity's database id, e.g.
+    ("player", 12, last_n, ...), so every cached window of one player or team can be dropped
+    together when new games of theirs are ingested. Frames are copied on the way in and out, so
+    callers can modify what they get back.
+    """
+
+    def __init__(self, max_bytes=128 * 2**20):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (DataFrame, bytes)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy()
+
+    def put(self, key, df):
+        df = df.copy()
+        # Summed per column, which is several times faster than DataFrame.memory_usage on small frames
+        n_bytes = int(sum(column.memory_usage(index=False, deep=True) for _, column in df.items()))
+        if n_bytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            self.entries[key] = (df, n_bytes)
+            self.size += n_bytes
+            while self.size > self.max_bytes:
+                _, (_, evicted_bytes) = self.entries.popitem(last=False)
+                self.size -= evicted_bytes
+
+    def invalidate(self, kind, entity_ids=None):
+        """Drops the entries of the given players or teams, or every entry of that kind if entity_ids is None."""
+        entity_ids = None if entity_ids is None else {int(entity_id) for entity_id in entity_ids}
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == kind and (entity_ids is None or key[1] in entity_ids)]:
+                self.size -= self.entries.pop(key)[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
@@ -2,7 +2,15 @@ import os
 import pandas as pd
 from data_manager import DataManager
 
-dm = DataManager()
+# Built on first use rather than at import, since it connects and loads every player and team
+_dm = None
+
+
+def get_data_manager():
+    global _dm
+    if _dm is None:
+        _dm = DataManager()
+    return _dm
 
 
 def extract_raw_data(file_path): # .csv
@@ -26,6 +34,7 @@ def load_available_props(file_path):
              'BlocksSGP': "blocks",
         }
     #debug stat_name_inputs = extract_raw_data("prop_lines/player_prop_categories.csv")
+    dm = get_data_manager()
     players = dm.query_players()
     player_names = [player.name for player in players]
     teams = dm.query_teams()
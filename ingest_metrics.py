@@ -0,0 +1,122 @@
+import time
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+# Upper bounds in seconds of the latency histogram buckets; the last bucket catches everything slower
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 30]
+
+
+class IngestMetrics:
+    """
+    Counters for one ingest run: nba_api calls per endpoint, rows and commits per table, and time
+    spent in each stage (normalize, upsert, ...). Safe to update from the fetch threads.
+    """
+
+    def __init__(self, name="ingest"):
+        self.name = name
+        self.lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.calls = defaultdict(lambda: {"calls": 0, "cache_hits": 0, "retries": 0, "errors": 0, "bytes": 0, "latencies": []})
+        self.rows = defaultdict(int)
+        self.commits = 0
+        self.games = 0
+        self.stages = defaultdict(float)
+
+    def record_call(self, endpoint_name, latency, n_bytes, retries=0):
+        with self.lock:
+            endpoint = self.calls[endpoint_name]
+            endpoint["calls"] += 1
+            endpoint["retries"] += retries
+            endpoint["bytes"] += n_bytes
+            endpoint["latencies"].append(latency)
+
+    def record_cache_hit(self, endpoint_name):
+        with self.lock:
+            self.calls[endpoint_name]["cache_hits"] += 1
+
+    def record_error(self, endpoint_name, retries=0):
+        with self.lock:
+            self.calls[endpoint_name]["errors"] += 1
+            self.calls[endpoint_name]["retries"] += retries
+
+    def record_rows(self, table_name, n_rows):
+        with self.lock:
+            self.rows[table_name] += n_rows
+
+    def record_commit(self):
+        with self.lock:
+            self.commits += 1
+
+    def record_games(self, n_games):
+        with self.lock:
+            self.games += n_games
+
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.stages[stage] += time.perf_counter() - start
+
+    @staticmethod
+    def latency_histogram(latencies):
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        for latency in latencies:
+            counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return dict(zip(labels, counts))
+
+    def summary(self):
+        """
+        Returns:
+            dict: The run's metrics as plain JSON-serializable values.
+        """
+        with self.lock:
+            elapsed = time.perf_counter() - self.start
+            endpoints = {}
+            for endpoint_name, endpoint in self.calls.items():
+                latencies = endpoint["latencies"]
+                endpoints[endpoint_name] = {
+                    "calls": endpoint["calls"],
+                    "cache_hits": endpoint["cache_hits"],
+                    "retries": endpoint["retries"],
+                    "errors": endpoint["errors"],
+                    "bytes": endpoint["bytes"],
+                    "latency_total": round(sum(latencies), 3),
+                    "latency_p50": round(float(np.percentile(latencies, 50)), 3) if latencies else None,
+                    "latency_p95": round(float(np.percentile(latencies, 95)), 3) if latencies else None,
+                    "latency_histogram": self.latency_histogram(latencies),
+                }
+            return {
+                "name": self.name,
+                "started_at": self.started_at.isoformat(),
+                "elapsed": round(elapsed, 3),
+                "games": self.games,
+                "games_per_minute": round(self.games / elapsed * 60, 2) if elapsed else 0.0,
+                "commits": self.commits,
+                "rows": dict(self.rows),
+                "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+                "endpoints": endpoints,
+            }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"{summary['name']}: {summary['games']} games in {summary['elapsed']:.1f}s "
+              f"({summary['games_per_minute']} games/min, {summary['commits']} commits)")
+        for endpoint_name, endpoint in summary["endpoints"].items():
+            print(f"  {endpoint_name}: {endpoint['calls']} calls, {endpoint['cache_hits']} cached, {endpoint['retries']} retries, "
+                  f"{endpoint['errors']} errors, {endpoint['bytes'] / 1e6:.1f} MB, "
+                  f"p50 {endpoint['latency_p50']}s, p95 {endpoint['latency_p95']}s, {endpoint['latency_total']}s total")
+        for table_name, n_rows in summary["rows"].items():
+            print(f"  {table_name}: {n_rows} rows")
+        for stage, seconds in summary["stages"].items():
+            print(f"  {stage}: {seconds:.1f}s")
+        return summary
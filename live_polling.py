@@ -0,0 +1,122 @@
+import time
+import hashlib
+from datetime import date
+import pandas as pd
+
+from backfill import STAT_TABLES
+from ingest_metrics import IngestMetrics
+from stat_normalization import stat_records
+
+
+def hash_boxscores(boxscores):
+    """Fingerprint of every frame of a game's boxscores; equal hashes mean nothing changed since the last poll."""
+    digest = hashlib.sha256()
+    for key in sorted(boxscores):
+        frame = boxscores[key]
+        digest.update(key.encode("utf-8"))
+        digest.update(",".join(map(str, frame.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def write_changed_rows(dm, game, boxscores, season, season_type, row_hashes):
+    """
+    Upserts the game row and only the stat rows whose values differ from the last poll, in one transaction.
+
+    Args:
+        row_hashes (dict): (table, key) -> hash of the row as last written; updated once the write commits.
+
+    Returns:
+        dict: Rows written per table.
+    """
+    session = dm.get_session()
+    try:
+        dm.lock_games(session, [game["GAME_ID"]])
+        db_game_id = dm.upsert_game(session, game, season, season_type, game_summary=boxscores["game_summary"])
+        written = {}
+        new_hashes = {}
+        for key, (model, index_elements, id_map_name) in STAT_TABLES.items():
+            changed = []
+            for record in stat_records(boxscores[key], model, db_game_id, getattr(dm, id_map_name), season):
+                row_key = (key, tuple(record[column] for column in index_elements))
+                row_hash = hash(tuple(record.items()))
+                if row_hashes.get(row_key) != row_hash:
+                    changed.append(record)
+                    new_hashes[row_key] = row_hash
+            dm.upsert_records(session, model, changed, index_elements)
+            written[model.__tablename__] = len(changed)
+        if written["trad_player_stats"] or written["adv_player_stats"]:
+            dm.refresh_player_game_logs(session, [db_game_id], [season])
+        dm.commit(session)
+        # Team game logs read the game row and team stats, which change without any player rows, and
+        # dropping them after the commit keeps a concurrent read from caching the old rows again
+        dm.invalidate_game_logs(session, [db_game_id])
+        # Only remember rows once they are stored, so a failed write is retried on the next poll
+        row_hashes.update(new_hashes)
+        return written
+
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def poll_live_games(dm, season, season_type, game_date=None, interval=None, max_polls=None):
+    """
+    Keeps the games of one day fresh while they are being played.
+
+    Each round fetches the summary of every game that is not Final yet. Games that have started get
+    their boxscores fetched and hashed. Unchanged games are skipped. Otherwise the game row and only
+    the stat rows that changed are upserted. Every round goes to the network rather than the response
+    cache, so a game turning Final is written with boxscores fetched after it ended. A game drops out
+    once it is stored as Final, and polling ends when every game has.
+
+    Args:
+        dm (DataManager): Used for fetching and writing.
+        season (str): Season of the games, e.g. "2023-24".
+        season_type (str): "Regular Season" or "Playoffs".
+        game_date (date or str): Day to poll; defaults to today.
+        interval (float): Seconds between the start of two rounds. Defaults to DataManager.LIVE_GAME_TTL.
+        max_polls (int): Stop after this many rounds even if games are still live.
+    """
+    game_date = game_date or date.today()
+    interval = dm.LIVE_GAME_TTL if interval is None else interval
+    dm.metrics = IngestMetrics(f"live {season} {season_type} {game_date}")
+    try:
+        dm.create_season_partitions(season)
+        games = dm.pull_all_games_from_season(season, season_type, game_date, game_date)
+        if games.empty:
+            print(f"No games found on {game_date}.")
+            return
+        live_games = {game["GAME_ID"]: game for _, game in games.iterrows()}
+        payload_hashes = {}
+        row_hashes = {}
+        polls = 0
+        while live_games and (max_polls is None or polls < max_polls):
+            start = time.monotonic()
+            polls += 1
+            for nba_game_id, game in list(live_games.items()):
+                try:
+                    game_summary = dm.pull_game_summary(nba_game_id, refresh=True)
+                    if game_summary.loc[0, "GAME_STATUS_ID"] == 1:
+                        continue  # not tipped off yet
+                    boxscores = dm.pull_boxscores_for_game(nba_game_id, game_summary=game_summary, refresh=True)
+                    game_status_text = game_summary.loc[0, "GAME_STATUS_TEXT"]
+                    payload_hash = hash_boxscores(boxscores)
+                    # The summary is part of the hash, so an unchanged Final game was already written as Final
+                    if payload_hashes.get(nba_game_id) != payload_hash:
+                        written = write_changed_rows(dm, game, boxscores, season, season_type, row_hashes)
+                        payload_hashes[nba_game_id] = payload_hash
+                        print(f"Game {nba_game_id} ({game_status_text}): updated {sum(written.values())} stat rows")
+                except Exception as e:
+                    print(f"Failed to poll game {nba_game_id}: {e}")
+                    continue
+
+                if dm.is_final(game_status_text):
+                    dm.metrics.record_games(1)
+                    del live_games[nba_game_id]
+            if live_games:
+                time.sleep(max(0.0, interval - (time.monotonic() - start)))
+    finally:
+        dm.finish_ingest_run()
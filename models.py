@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Float, JSON, UniqueConstraint, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from db_config import get_database_engine
@@ -11,7 +11,7 @@ class Team(Base):
     
     id = Column(Integer, primary_key=True)
     nba_team_id = Column(Integer, unique=True, nullable=False)
-    nickname = Column(String)  
+    nickname = Column(String, index=True)  
     city = Column(String)
     state = Column(String)
     full_name = Column(String)  
@@ -26,7 +26,7 @@ class Player(Base):
     __tablename__ = 'players'
     id = Column(Integer, primary_key=True)
     nba_player_id = Column(Integer, unique=True, nullable=False)
-    name = Column(String)
+    name = Column(String, index=True)
     nickname = Column(String)
     player_slug = Column(String)
     jersey_number = Column(String)
@@ -48,13 +48,18 @@ class Game(Base):
     
     id = Column(Integer, primary_key=True)
     nba_game_id = Column(Integer, unique=True, nullable=False)
-    date = Column(Date)
+    date = Column(Date, index=True)
     game_status_text = Column(String)
     season = Column(String)
     season_type = Column(String)
     home_team_id = Column(Integer, ForeignKey('teams.id'))
     away_team_id = Column(Integer, ForeignKey('teams.id'))
     live_period = Column(Integer)
+    # Set whenever the game or its stats are written, so other processes can tell which cached game logs went stale
+    updated_at = Column(DateTime, server_default=func.now(), index=True)
+
+    # Season listings filter on season and season_type and read games in date order
+    __table_args__ = (Index('ix_games_season_season_type_date', 'season', 'season_type', 'date', postgresql_include=['id']),)
     
     home_team = relationship("Team", foreign_keys=[home_team_id])
     away_team = relationship("Team", foreign_keys=[away_team_id])
@@ -92,7 +97,11 @@ class TradTeamStats(Base):
     pts = Column(Integer, nullable=False)
     plus_minus = Column(Integer, nullable=False)
 
-    __table_args__ = (UniqueConstraint('game_id', 'team_id', name='_game_team_uc'),)
+    __table_args__ = (
+        UniqueConstraint('game_id', 'team_id', name='_game_team_uc'),
+        # The unique constraint leads with game_id, so a team's game log needs its own index
+        Index('ix_trad_team_stats_team_id_game_id', 'team_id', 'game_id'),
+    )
 
     # Relationships
     game = relationship('Game', back_populates='trad_team_stats')
@@ -103,6 +112,8 @@ class TradPlayerStats(Base):
     __tablename__ = 'trad_player_stats'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    # Partition key; Postgres requires it in the primary key and every unique constraint
+    season = Column(String, primary_key=True)
     game_id = Column(Integer, ForeignKey('games.id'), nullable=False)
     player_id = Column(Integer, ForeignKey('players.id'), nullable=False)
     start_position = Column(String, nullable=True)
@@ -127,7 +138,12 @@ class TradPlayerStats(Base):
     pts = Column(Integer, nullable=False)
     plus_minus = Column(Integer, nullable=False)
 
-    __table_args__ = (UniqueConstraint('game_id', 'player_id', name='_game_player_uc'),)
+    __table_args__ = (
+        UniqueConstraint('game_id', 'player_id', 'season', name='_game_player_uc'),
+        # The unique constraint leads with game_id, so a player's game log needs its own index
+        Index('ix_trad_player_stats_player_id_game_id', 'player_id', 'game_id'),
+        {'postgresql_partition_by': 'LIST (season)'},
+    )
 
     # Relationships
     game = relationship('Game', back_populates='trad_player_stats')
@@ -176,6 +192,8 @@ class AdvPlayerStats(Base):
     __tablename__ = 'adv_player_stats'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    # Partition key; Postgres requires it in the primary key and every unique constraint
+    season = Column(String, primary_key=True)
     game_id = Column(Integer, ForeignKey('games.id'), nullable=False)
     player_id = Column(Integer, ForeignKey('players.id'), nullable=False)
     minutes = Column(Float, nullable=False)
@@ -202,7 +220,10 @@ class AdvPlayerStats(Base):
     poss = Column(Integer, nullable=False)
     pie = Column(Float, nullable=False)
 
-    __table_args__ = (UniqueConstraint('game_id', 'player_id', name='_adv_game_player_uc'),)
+    __table_args__ = (
+        UniqueConstraint('game_id', 'player_id', 'season', name='_adv_game_player_uc'),
+        {'postgresql_partition_by': 'LIST (season)'},
+    )
 
     # Relationships
     game = relationship('Game', back_populates='adv_player_stats')
@@ -240,10 +261,78 @@ class TeamRollingAverages(Base):
 
     game = relationship('Game', back_populates='team_rolling_averages')
     team = relationship('Team', back_populates='team_rolling_averages')
-    
 
 
 
-engine = get_database_engine()  
-Base.metadata.create_all(engine)
+class PlayerGameLog(Base):
+    """One pre-joined row per player and game, kept up to date by DataManager.refresh_player_game_logs."""
+    __tablename__ = 'player_game_logs'
+
+    id = Column(Integer, primary_key=True)
+    player_id = Column(Integer, ForeignKey('players.id'), nullable=False)
+    game_id = Column(Integer, ForeignKey('games.id'), nullable=False)
+    date = Column(Date)
+    season = Column(String)
+    season_type = Column(String)
+    player_name = Column(String)
+    player_position = Column(String)
+    minutes = Column(Float)
+    points = Column(Integer)
+    rebounds = Column(Integer)
+    assists = Column(Integer)
+    efg = Column(Float)
+    fg3a = Column(Integer)
+    fg3m = Column(Integer)
+    fg3_pct = Column(Float)
+    fga = Column(Integer)
+    fgm = Column(Integer)
+    fta = Column(Integer)
+    ft_pct = Column(Float)
+    steals = Column(Integer)
+    blocks = Column(Integer)
+
+    __table_args__ = (
+        UniqueConstraint('player_id', 'game_id', name='_log_player_game_uc'),
+        Index('ix_player_game_logs_player_id_date', 'player_id', 'date'),
+    )
+
+class SyncJournalEntry(Base):
+    __tablename__ = 'sync_journal'
+
+    id = Column(Integer, primary_key=True)
+    nba_game_id = Column(Integer, unique=True, nullable=False)
+    season = Column(String, nullable=False)
+    season_type = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # pending, fetched, live (written before Final), ingested or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String)
+    updated_at = Column(DateTime)
+
+
+class IngestRun(Base):
+    __tablename__ = 'ingest_runs'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    elapsed = Column(Float)
+    games = Column(Integer)
+    games_per_minute = Column(Float)
+    commits = Column(Integer)
+    summary = Column(JSON)  # full IngestMetrics.summary(), including per-endpoint latencies and per-table rows
+
+
+def create_schema(engine=None):
+    """
+    Creates any missing tables on a fresh database. Existing databases are managed by the Alembic
+    migrations in nba_01_alembic; after bootstrapping, `alembic stamp head` lets them take over.
+
+    The season-partitioned stat tables are created as parents without any partitions, not even a
+    default one. DataManager.ensure_season_partitions creates a season's partitions, and the writes
+    to those tables call it before inserting.
+    """
+    Base.metadata.create_all(engine or get_database_engine())
+
 
+if __name__ == "__main__":
+    create_schema()
@@ -0,0 +1,93 @@
+"""Partition player stats by season
+
+Revision ID: a3c8e61f92d4
+Revises: 7d2f4b8e1c63
+Create Date: 2026-10-18 16:05:39.612048
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e61f92d4'
+down_revision: Union[str, None] = '7d2f4b8e1c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (unique constraint, secondary indexes as name -> columns)
+PARTITIONED_TABLES = {
+    'trad_player_stats': ('_game_player_uc', {'ix_trad_player_stats_player_id_game_id': 'player_id, game_id'}),
+    'adv_player_stats': ('_adv_game_player_uc', {}),
+}
+
+
+def partition_name(table_name, season):
+    return f"{table_name}_{re.sub(r'[^0-9a-zA-Z]', '_', season)}"
+
+
+def rebuild_table(table_name, partitioned):
+    """
+    Postgres can't turn an existing table into a partitioned one (or back), so the table is renamed,
+    recreated under its old name and refilled, keeping ids, constraint names and the id sequence.
+    """
+    bind = op.get_bind()
+    unique_name, indexes = PARTITIONED_TABLES[table_name]
+    old = f"{table_name}_old"
+    op.execute(f"ALTER TABLE {table_name} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table_name}_pkey TO {old}_pkey")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {unique_name} TO {unique_name}_old")
+    for index_name in indexes:
+        op.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_old")
+    op.execute(f"ALTER SEQUENCE {table_name}_id_seq RENAME TO {old}_id_seq")
+    # Quoted, since trad_player_stats has a column named "to"
+    columns = [f'"{column["name"]}"' for column in sa.inspect(bind).get_columns(old) if column['name'] != 'season']
+
+    if partitioned:
+        op.execute(f"CREATE TABLE {table_name} (LIKE {old}, season VARCHAR NOT NULL) PARTITION BY LIST (season)")
+        key = "id, season"
+        unique_columns = "game_id, player_id, season"
+    else:
+        op.execute(f"CREATE TABLE {table_name} (LIKE {old})")
+        op.execute(f"ALTER TABLE {table_name} DROP COLUMN season")
+        key = "id"
+        unique_columns = "game_id, player_id"
+    op.execute(f"CREATE SEQUENCE {table_name}_id_seq OWNED BY {table_name}.id")
+    op.execute(f"ALTER TABLE {table_name} ALTER COLUMN id SET DEFAULT nextval('{table_name}_id_seq')")
+    op.execute(f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY ({key})")
+    op.execute(f"ALTER TABLE {table_name} ADD CONSTRAINT {unique_name} UNIQUE ({unique_columns})")
+    op.execute(f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_game_id_fkey FOREIGN KEY (game_id) REFERENCES games (id)")
+    op.execute(f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_player_id_fkey FOREIGN KEY (player_id) REFERENCES players (id)")
+
+    if partitioned:
+        seasons = [season for season, in bind.execute(sa.text("SELECT DISTINCT season FROM games WHERE season IS NOT NULL"))]
+        for season in seasons:
+            quoted_season = season.replace("'", "''")
+            op.execute(f"CREATE TABLE {partition_name(table_name, season)} PARTITION OF {table_name} FOR VALUES IN ('{quoted_season}')")
+        op.execute(f"CREATE TABLE {table_name}_default PARTITION OF {table_name} DEFAULT")
+        op.execute(
+            f"INSERT INTO {table_name} ({', '.join(columns)}, season) "
+            f"SELECT {', '.join('o.' + column for column in columns)}, COALESCE(g.season, 'unknown') "
+            f"FROM {old} o JOIN games g ON g.id = o.game_id"
+        )
+    else:
+        op.execute(f"INSERT INTO {table_name} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM {old}")
+    op.execute(f"SELECT setval('{table_name}_id_seq', COALESCE((SELECT max(id) FROM {table_name}), 0) + 1, false)")
+    for index_name, index_columns in indexes.items():
+        op.execute(f"CREATE INDEX {index_name} ON {table_name} ({index_columns})")
+    # Dropping the old table also drops its partitions and its sequence
+    op.execute(f"DROP TABLE {old}")
+
+
+def upgrade() -> None:
+    for table_name in PARTITIONED_TABLES:
+        rebuild_table(table_name, partitioned=True)
+
+
+def downgrade() -> None:
+    for table_name in PARTITIONED_TABLES:
+        rebuild_table(table_name, partitioned=False)
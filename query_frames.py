@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, BigInteger, SmallInteger, Float, Numeric, Boolean, Date, DateTime
+
+
+def column_array(values, sql_type):
+    """
+    Turns one column of fetched values into a numpy array with the dtype matching its SQL type.
+
+    Integer columns become int32 (int64 for BIGINT), or float64 when they contain nulls, the same
+    way pandas would upcast them. Float and Numeric become float64, Date and DateTime datetime64,
+    and Boolean bool unless nulls are present. Anything else (strings, JSON) stays object.
+    """
+    if isinstance(sql_type, Integer):
+        dtype = "int64" if isinstance(sql_type, BigInteger) else "int16" if isinstance(sql_type, SmallInteger) else "int32"
+        try:
+            return np.array(values, dtype=dtype)
+        except TypeError:
+            return np.array(values, dtype="float64")  # None becomes NaN
+    if isinstance(sql_type, (Float, Numeric)):
+        return np.array(values, dtype="float64")
+    if isinstance(sql_type, (Date, DateTime)):
+        return pd.to_datetime(pd.Series(values, dtype=object)).to_numpy()
+    if isinstance(sql_type, Boolean) and None not in values:
+        return np.array(values, dtype=bool)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def read_frame(session, statement):
+    """
+    Runs a Core select and builds the DataFrame column by column straight from the fetched tuples,
+    without creating ORM objects.
+
+    Args:
+        session (Session): Session whose connection runs the statement.
+        statement (Select): Core select of columns, e.g. select(Player.name, Player.position).
+
+    Returns:
+        pd.DataFrame: One column per selected column, named by its label, typed by column_array.
+    """
+    result = session.connection().execute(statement)
+    names = list(result.keys())
+    rows = result.fetchall()
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    types = [column.type for column in statement.selected_columns]
+    return pd.DataFrame({name: column_array(column_values, sql_type) for name, column_values, sql_type in zip(names, values, types)}, copy=False)
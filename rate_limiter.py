@@ -0,0 +1,212 @@
+import json
+import random
+import threading
+import time
+import multiprocessing
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.exceptions import HTTPError, Timeout, ConnectionError
+
+# Positions in the limiter state, which is a list or a multiprocessing.Array so processes can share it
+TAT, RATE, LATENCY, BASELINE = range(4)
+
+
+class HTTPStatusError(Exception):
+    """An error status from stats.nba.com, which nba_api would otherwise surface as a JSON decode error."""
+
+    def __init__(self, status_code, url=None, retry_after=None):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.retry_after = retry_after  # seconds the server asked us to wait, if it said
+
+
+# Headers of the last response each thread received through nba_api, which keeps only the body and status
+last_response = threading.local()
+
+
+def remember_response(response, *args, **kwargs):
+    last_response.url = response.url
+    last_response.headers = response.headers
+
+
+def track_nba_api_responses():
+    """Hooks the requests session nba_api shares so raise_for_status can read the response headers."""
+    from nba_api.stats.library.http import NBAStatsHTTP
+    hooks = NBAStatsHTTP.get_session().hooks["response"]
+    if remember_response not in hooks:
+        hooks.append(remember_response)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header given in seconds or as an HTTP date, or None."""
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def raise_for_status(nba_response):
+    """Raises HTTPStatusError if an nba_api response (endpoint.nba_response) has a 4xx or 5xx status."""
+    status_code = getattr(nba_response, "_status_code", None)
+    if status_code is not None and status_code >= 400:
+        url = nba_response.get_url()
+        headers = getattr(last_response, "headers", None) if getattr(last_response, "url", None) == url else None
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+        raise HTTPStatusError(status_code, url, retry_after=retry_after)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every nba_api call, holding up to `burst` requests at `requests_per_second`.
+
+    The rate adapts: it is halved whenever stats.nba.com throttles (429 or a timeout), cut by a tenth
+    when responses get slow_factor times and at least min_slowdown seconds slower than usual, and
+    otherwise raised a little after each success, up to max_rate. max_rate defaults to
+    requests_per_second, so the limiter only recovers to the configured rate and never probes past
+    it. Calls made through call() are retried with jittered exponential backoff.
+
+    nba_api checks no status codes, so a 429 only counts as throttling if the call raises
+    HTTPStatusError for it; DataManager.fetch_endpoint does that with raise_for_status.
+
+    Worker processes can share one budget, including what it has learned, by calling share_budget
+    with the array returned by new_shared_state().
+    """
+
+    def __init__(self, requests_per_second=3.0, min_rate=0.25, max_rate=None, burst=2,
+                 increase=0.05, slow_factor=2.0, min_slowdown=0.5, max_retries=5, base_backoff=1.0, max_backoff=60.0):
+        self.lock = threading.Lock()
+        # Theoretical arrival time of the next request, current rate, smoothed latency, fastest smoothed latency
+        self.state = [0.0, 0.0, 0.0, 0.0]
+        self.min_rate = min_rate
+        self.burst = burst
+        self.increase = increase
+        self.slow_factor = slow_factor
+        self.min_slowdown = min_slowdown
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        if requests_per_second <= 0:
+            raise ValueError(f"requests_per_second must be positive, got {requests_per_second}")
+        self.state[RATE] = requests_per_second
+        self.max_rate = requests_per_second if max_rate is None else max(max_rate, requests_per_second)
+
+    @property
+    def requests_per_second(self):
+        return self.state[RATE]
+
+    def new_shared_state(self):
+        return multiprocessing.Array("d", list(self.state))
+
+    def share_budget(self, shared_state):
+        self.state = shared_state
+        self.lock = shared_state.get_lock()
+
+    def set_rate(self, requests_per_second):
+        """Sets the current rate and makes it the ceiling the limiter adapts up to."""
+        if requests_per_second <= 0:
+            raise ValueError(f"requests_per_second must be positive, got {requests_per_second}")
+        with self.lock:
+            self.state[RATE] = requests_per_second
+            self.max_rate = requests_per_second
+            self.min_rate = min(self.min_rate, requests_per_second)
+
+    def reserve_slot(self, now):
+        # time.monotonic is system-wide on Linux, so slots from different processes are comparable
+        with self.lock:
+            interval = 1.0 / self.state[RATE]
+            tat = max(now, self.state[TAT])
+            self.state[TAT] = tat + interval
+        # A full bucket lets `burst` requests through back to back
+        return max(now, tat - (self.burst - 1) * interval)
+
+    def wait(self):
+        # Reserve the next free slot under the lock, then sleep outside it so other threads can queue up
+        now = time.monotonic()
+        slot = self.reserve_slot(now)
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self, latency):
+        with self.lock:
+            smoothed = latency if not self.state[LATENCY] else 0.8 * self.state[LATENCY] + 0.2 * latency
+            self.state[LATENCY] = smoothed
+            baseline = self.state[BASELINE] = min(self.state[BASELINE] or smoothed, smoothed)
+            if smoothed > self.slow_factor * baseline and smoothed - baseline > self.min_slowdown:
+                # Responses slowing down is the first sign of throttling, so back off before the 429s
+                self.state[RATE] = max(self.min_rate, self.state[RATE] * 0.9)
+            else:
+                self.state[RATE] = min(self.max_rate, self.state[RATE] + self.increase)
+
+    def record_throttle(self):
+        with self.lock:
+            self.state[RATE] = max(self.min_rate, self.state[RATE] / 2)
+            # Let the slower rate take effect straight away instead of after the already reserved slots
+            self.state[TAT] = max(self.state[TAT], time.monotonic() + 1.0 / self.state[RATE])
+
+    @staticmethod
+    def status_code(error):
+        if isinstance(error, HTTPStatusError):
+            return error.status_code
+        if isinstance(error, HTTPError) and error.response is not None:
+            return error.response.status_code
+        return None
+
+    @staticmethod
+    def is_throttled(error):
+        if RateLimiter.status_code(error) is not None:
+            return RateLimiter.status_code(error) == 429
+        # stats.nba.com usually throttles by leaving requests hanging rather than answering 429
+        return isinstance(error, Timeout)
+
+    @staticmethod
+    def is_retryable(error):
+        status_code = RateLimiter.status_code(error)
+        if status_code is not None:
+            return status_code == 429 or status_code >= 500
+        # An HTML error page instead of JSON shows up as a decode error
+        return isinstance(error, (Timeout, ConnectionError, json.JSONDecodeError))
+
+    def backoff(self, attempt, error=None):
+        retry_after = None
+        if isinstance(error, HTTPStatusError):
+            retry_after = error.retry_after
+        elif isinstance(error, HTTPError) and error.response is not None:
+            retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+        return min(self.max_backoff, self.base_backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def call(self, function, *args, **kwargs):
+        """
+        Runs function(*args, **kwargs) within the budget, retrying throttled and transient failures.
+
+        Returns:
+            Whatever function returns. The last error is raised once max_retries is used up, and
+            errors that are not worth retrying are raised straight away.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.wait()
+            start = time.monotonic()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                if self.is_throttled(e):
+                    self.record_throttle()
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    raise
+                wait = self.backoff(attempt, e)
+                print(f"nba_api call failed ({type(e).__name__}), retrying in {wait:.1f} seconds at {self.requests_per_second:.2f} requests/s...")
+                time.sleep(wait)
+                continue
+            self.record_success(time.monotonic() - start)
+            return result
+
+
+# One budget shared by every nba_api call made from this process
+nba_api_limiter = RateLimiter()
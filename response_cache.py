@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import pandas as pd
+
+
+class CacheMiss(LookupError):
+    pass
+
+
+class ResponseCache:
+    """
+    Stores raw nba_api JSON responses on disk, keyed by endpoint name and request parameters.
+
+    Entries written with ttl=None never expire (finished games); others expire ttl seconds after
+    they were fetched. In replay mode expiry is ignored and nothing is fetched from the network.
+    """
+
+    def __init__(self, directory="api_cache", replay=False):
+        self.directory = directory
+        self.replay = replay
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    @staticmethod
+    def make_key(endpoint_name, params):
+        content = json.dumps({"endpoint": endpoint_name, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_path(self, endpoint_name, params):
+        return os.path.join(self.directory, endpoint_name, f"{self.make_key(endpoint_name, params)}.json")
+
+    def get(self, endpoint_name, params, permanent_only=False):
+        """
+        Returns the cached payload, or None if there is none or it expired. With permanent_only, entries
+        written with a ttl are treated as missing too, e.g. boxscores cached while their game was live.
+        """
+        if not self.enabled:
+            return None
+        path = self.get_path(endpoint_name, params)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        expires_at = entry.get("expires_at")
+        if not self.replay and expires_at is not None and (permanent_only or expires_at < time.time()):
+            return None
+        return entry["payload"]
+
+    def put(self, endpoint_name, params, payload, ttl=None):
+        if not self.enabled:
+            return
+        path = self.get_path(endpoint_name, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fetched_at = time.time()
+        entry = {
+            "endpoint": endpoint_name,
+            "params": params,
+            "fetched_at": fetched_at,
+            "expires_at": None if ttl is None else fetched_at + ttl,
+            "payload": payload,
+        }
+        # Write to a temp file and swap it in so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+def frames_from_payload(payload):
+    """Builds {result set name: DataFrame} from a raw stats.nba.com JSON response."""
+    result_sets = payload.get("resultSets", payload.get("resultSet"))
+    if isinstance(result_sets, dict):
+        result_sets = [result_sets]
+    return {
+        result_set["name"]: pd.DataFrame(result_set["rowSet"], columns=result_set["headers"])
+        for result_set in result_sets
+    }
@@ -0,0 +1,184 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, Float
+
+
+# nba_api column holding the entity each stat table is keyed on
+ENTITY_COLUMNS = {"team_id": "TEAM_ID", "player_id": "PLAYER_ID"}
+
+
+def parse_minutes(minutes):
+    """Turns "31:12" style minutes into 31.0, keeping only the whole minutes. Missing values become 0."""
+    whole_minutes = np.char.partition(minutes.fillna("").to_numpy(dtype=str), ":")[:, 0]
+    whole_minutes[whole_minutes == ""] = "0"
+    return whole_minutes.astype("float64")
+
+
+@lru_cache(maxsize=None)
+def stat_columns(model):
+    """
+    Column rules shared by normalize_stat_frame and stat_records, so both paths convert the same way.
+
+    "minutes" comes from MIN and "season" from the season argument; every other column comes from
+    the upper-cased column name and is converted by the kind of its SQL type.
+
+    Returns:
+        tuple: (entity column, [(column name, nba_api column, kind)]) for every column but id,
+            game_id and the entity column, in table order. kind is "minutes", "season", "integer",
+            "float" or "text"; the season column has no nba_api column.
+    """
+    entity_column = "player_id" if "player_id" in model.__table__.columns else "team_id"
+    columns = []
+    for column in model.__table__.columns:
+        if column.name in ("id", "game_id", entity_column):
+            continue
+        if column.name == "minutes":
+            columns.append(("minutes", "MIN", "minutes"))
+        elif column.name == "season":
+            columns.append(("season", None, "season"))
+        elif isinstance(column.type, Integer):
+            columns.append((column.name, column.name.upper(), "integer"))
+        elif isinstance(column.type, Float):
+            columns.append((column.name, column.name.upper(), "float"))
+        else:
+            columns.append((column.name, column.name.upper(), "text"))
+    return entity_column, columns
+
+
+def check_season(model, season):
+    if "season" in model.__table__.columns and season is None:
+        raise ValueError(f"{model.__tablename__} is partitioned by season, so a season is required.")
+
+
+def normalize_stat_frame(stats_df, model, db_game_id, id_map, season=None):
+    """
+    Converts an nba_api boxscore frame into the columns and dtypes of one of the stat tables.
+
+    Columns follow stat_columns. Integer and Float columns get nulls replaced with 0, text columns
+    get "". Boxscores of many games can be concatenated and normalized in one call by passing one
+    db_game_id per row.
+
+    Args:
+        stats_df (pd.DataFrame): PlayerStats or TeamStats frame from a traditional or advanced boxscore.
+        model: One of TradTeamStats, AdvTeamStats, TradPlayerStats or AdvPlayerStats.
+        db_game_id (int or array-like): Database id of the game, or one id per row of stats_df.
+        id_map (dict): nba id -> database id for the table's team_id or player_id column.
+        season (str): Season of the games, required by the season-partitioned player stat tables.
+
+    Returns:
+        pd.DataFrame: One row per stat line, ready for to_records or COPY.
+    """
+    entity_column, columns = stat_columns(model)
+    game_ids = np.broadcast_to(np.asarray(db_game_id, dtype="int64"), (len(stats_df),))
+    db_ids = stats_df[ENTITY_COLUMNS[entity_column]].map(id_map)
+    if entity_column == "player_id":
+        # Players we have no record of are skipped rather than failing the whole game
+        known = db_ids.notna().to_numpy()
+        stats_df = stats_df[known]
+        db_ids = db_ids[known]
+        game_ids = game_ids[known]
+    elif db_ids.isna().any():
+        missing = stats_df.loc[db_ids.isna(), ENTITY_COLUMNS[entity_column]].tolist()
+        raise KeyError(f"Unknown nba team ids: {missing}")
+    check_season(model, season)
+
+    numeric_sources = [source for _, source, kind in columns if kind in ("integer", "float")]
+    # Convert every numeric stat in one 2-D pass; None becomes NaN and then 0
+    numeric = stats_df[numeric_sources]
+    try:
+        numeric = numeric.to_numpy(dtype="float64")
+    except (TypeError, ValueError):
+        numeric = numeric.apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+    numeric = np.nan_to_num(numeric, nan=0.0)
+
+    normalized = {"game_id": game_ids, entity_column: db_ids.to_numpy(dtype="int64")}
+    for name, source, kind in columns:
+        if kind == "minutes":
+            normalized[name] = parse_minutes(stats_df[source])
+        elif kind == "season":
+            normalized[name] = np.full(len(stats_df), season, dtype=object)
+        elif kind == "text":
+            normalized[name] = stats_df[source].fillna("").astype(str).to_numpy()
+        else:
+            values = numeric[:, numeric_sources.index(source)]
+            normalized[name] = values.astype("int64") if kind == "integer" else values
+    return pd.DataFrame(normalized)
+
+
+def to_number(value):
+    # Per-value version of the numeric conversion in normalize_stat_frame: anything missing or unparsable is 0
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if number != number else number
+
+
+def to_minutes(value):
+    return float(("" if value is None or value != value else str(value)).partition(":")[0] or "0")
+
+
+def to_text(value):
+    return "" if value is None or value != value else str(value)
+
+
+def to_integer(value):
+    return int(to_number(value))
+
+
+# Per-value conversion of each stat_columns kind, used by stat_records
+VALUE_CONVERSIONS = {"minutes": to_minutes, "integer": to_integer, "float": to_number, "text": to_text}
+
+
+def stat_records(stats_df, model, db_game_id, id_map, season=None):
+    """
+    Gives the same records as to_records(normalize_stat_frame(...)) for the boxscore of one game,
+    converting row by row in plain Python.
+
+    normalize_stat_frame costs a few milliseconds per call however few rows it gets, which only pays
+    off on batches of games. A single game has 2 team rows or about 30 player rows, and those are
+    converted several times faster here, so the per-game writes of sync_games and live polling use
+    this path. Both read their columns from stat_columns.
+
+    Args:
+        stats_df (pd.DataFrame): PlayerStats or TeamStats frame of one game.
+        model: One of TradTeamStats, AdvTeamStats, TradPlayerStats or AdvPlayerStats.
+        db_game_id (int): Database id of the game.
+        id_map (dict): nba id -> database id for the table's team_id or player_id column.
+        season (str): Season of the game, required by the season-partitioned player stat tables.
+
+    Returns:
+        list of dict: One record per stat line.
+    """
+    entity_column, columns = stat_columns(model)
+    check_season(model, season)
+
+    # One conversion of the whole frame to Python values is cheaper than pulling each column out
+    positions = {name: i for i, name in enumerate(stats_df.columns)}
+    rows = stats_df.to_numpy(dtype=object).tolist()
+    entity_position = positions[ENTITY_COLUMNS[entity_column]]
+    if entity_column == "team_id":
+        missing = [row[entity_position] for row in rows if row[entity_position] not in id_map]
+        if missing:
+            raise KeyError(f"Unknown nba team ids: {missing}")
+    converters = [(name, None, None) if kind == "season" else (name, positions[source], VALUE_CONVERSIONS[kind])
+                  for name, source, kind in columns]
+
+    records = []
+    for row in rows:
+        db_id = id_map.get(row[entity_position])
+        if db_id is None:
+            continue  # players we have no record of are skipped, as in normalize_stat_frame
+        record = {"game_id": int(db_game_id), entity_column: int(db_id)}
+        for name, position, convert in converters:
+            record[name] = season if convert is None else convert(row[position])
+        records.append(record)
+    return records
+
+
+def to_records(normalized):
+    """Rows of a normalized frame as plain Python dicts for a multi-row insert."""
+    columns = list(normalized.columns)
+    values = [normalized[column].tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
@@ -0,0 +1,182 @@
+import time
+import random
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from models import SyncJournalEntry
+
+
+class SyncJournal:
+    """
+    Per-game fetch and ingest state for a sync, kept in the sync_journal table so an interrupted
+    run can pick up where it stopped instead of starting the season over.
+    """
+
+    def __init__(self, get_session):
+        self.get_session = get_session
+
+    def register(self, season, season_type, nba_game_ids):
+        records = [
+            dict(nba_game_id=int(nba_game_id), season=season, season_type=season_type, status="pending", attempts=0, updated_at=datetime.now())
+            for nba_game_id in nba_game_ids
+        ]
+        if not records:
+            return
+        session = self.get_session()
+        try:
+            # Games already in the journal keep their state; live ones are still picked up by pending_game_ids
+            session.execute(insert(SyncJournalEntry).values(records).on_conflict_do_nothing(index_elements=['nba_game_id']))
+            session.commit()
+        finally:
+            session.close()
+
+    def pending_game_ids(self, season, season_type, max_attempts=5):
+        session = self.get_session()
+        try:
+            rows = session.query(SyncJournalEntry.nba_game_id).filter(
+                SyncJournalEntry.season == season,
+                SyncJournalEntry.season_type == season_type,
+                SyncJournalEntry.status != "ingested",
+                SyncJournalEntry.attempts < max_attempts,
+            ).all()
+            return {nba_game_id for nba_game_id, in rows}
+        finally:
+            session.close()
+
+    def failed_game_ids(self, season, season_type):
+        session = self.get_session()
+        try:
+            rows = session.query(SyncJournalEntry.nba_game_id).filter(
+                SyncJournalEntry.season == season,
+                SyncJournalEntry.season_type == season_type,
+                SyncJournalEntry.status == "failed",
+            ).all()
+            return {nba_game_id for nba_game_id, in rows}
+        finally:
+            session.close()
+
+    def reset_failed(self, season, season_type):
+        """Gives failed games a fresh set of attempts, including ones that used up max_attempts in earlier runs."""
+        session = self.get_session()
+        try:
+            session.query(SyncJournalEntry).filter(
+                SyncJournalEntry.season == season,
+                SyncJournalEntry.season_type == season_type,
+                SyncJournalEntry.status == "failed",
+            ).update({"status": "pending", "attempts": 0, "updated_at": datetime.now()}, synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+
+    def mark(self, nba_game_ids, status, error=None):
+        nba_game_ids = [int(nba_game_id) for nba_game_id in nba_game_ids]
+        if not nba_game_ids:
+            return
+        values = {"status": status, "updated_at": datetime.now()}
+        if status == "failed":
+            values["attempts"] = SyncJournalEntry.attempts + 1
+            values["last_error"] = str(error)[:1000]
+        elif status in ("ingested", "live"):
+            # A game that made it into the database starts over if it ever fails later
+            values["attempts"] = 0
+            values["last_error"] = None
+        session = self.get_session()
+        try:
+            session.query(SyncJournalEntry).filter(SyncJournalEntry.nba_game_id.in_(nba_game_ids)).update(values, synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+
+    def progress(self, season, season_type):
+        session = self.get_session()
+        try:
+            rows = session.query(SyncJournalEntry.status, func.count(SyncJournalEntry.id)).filter(
+                SyncJournalEntry.season == season,
+                SyncJournalEntry.season_type == season_type,
+            ).group_by(SyncJournalEntry.status).all()
+            return dict(rows)
+        finally:
+            session.close()
+
+    def print_progress(self, season, season_type):
+        counts = self.progress(season, season_type)
+        total = sum(counts.values())
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+        print(f"{season} {season_type}: {counts.get('ingested', 0)}/{total} games ingested ({summary})")
+
+
+def run_journaled(dm, games, season, season_type, write_batch, batch_size=1, max_workers=4, max_attempts=5, retry_backoff=30,
+                  retry_failed=False):
+    """
+    Fetches and writes games while recording each game's state in the sync journal.
+
+    Games already ingested by an earlier run are skipped. Games written before they were Final are
+    marked live rather than ingested, so the next run fetches them again. A game whose fetch or write
+    fails is marked failed and retried in a later round, after an exponential backoff, until it has
+    failed max_attempts times in a row across runs.
+
+    Args:
+        dm (DataManager): Used for fetching boxscores and opening sessions.
+        games (pd.DataFrame): Games as returned by pull_all_games_from_season.
+        season (str): Season the games belong to.
+        season_type (str): "Regular Season" or "Playoffs".
+        write_batch (callable): Takes a list of (game, boxscores) pairs and writes them.
+        batch_size (int): Games handed to write_batch at once.
+        max_workers (int): Threads fetching boxscores at once.
+        max_attempts (int): Failures after which a game is left alone.
+        retry_backoff (float): Seconds to wait before the first retry round; doubles each round.
+        retry_failed (bool): Give games that used up max_attempts in earlier runs another max_attempts.
+
+    Raises:
+        RuntimeError: If games of the run are still failed at the end, listing them.
+    """
+    journal = SyncJournal(dm.get_session)
+    journal.register(season, season_type, games['GAME_ID'])
+    if retry_failed:
+        journal.reset_failed(season, season_type)
+    written = set()
+
+    def flush(batch):
+        nba_game_ids = [game['GAME_ID'] for game, _ in batch]
+        journal.mark(nba_game_ids, "fetched")
+        try:
+            write_batch(batch)
+        except Exception as e:
+            print(f"Failed to write {len(batch)} games: {e}")
+            journal.mark(nba_game_ids, "failed", e)
+            return
+        final = [game['GAME_ID'] for game, boxscores in batch if dm.is_final(boxscores["game_summary"].loc[0, "GAME_STATUS_TEXT"])]
+        journal.mark(final, "ingested")
+        journal.mark([nba_game_id for nba_game_id in nba_game_ids if nba_game_id not in final], "live")
+        written.update(int(nba_game_id) for nba_game_id in nba_game_ids)
+
+    for attempt in range(max_attempts):
+        # Live games stay pending for the next run, but are written only once per run
+        pending = journal.pending_game_ids(season, season_type, max_attempts) - written
+        todo = games[games['GAME_ID'].astype(int).isin(pending)]
+        if todo.empty:
+            break
+        if attempt:
+            wait = retry_backoff * 2 ** (attempt - 1) * random.uniform(0.8, 1.2)
+            print(f"Retrying {len(todo)} games in {wait:.0f} seconds...")
+            time.sleep(wait)
+
+        batch = []
+        for game, boxscores in dm.fetch_boxscores(todo, max_workers, raise_errors=False):
+            if isinstance(boxscores, Exception):
+                print(f"Failed to fetch game {game['GAME_ID']}: {boxscores}")
+                journal.mark([game['GAME_ID']], "failed", boxscores)
+                continue
+            batch.append((game, boxscores))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        journal.print_progress(season, season_type)
+
+    failed = sorted(games.loc[games['GAME_ID'].astype(int).isin(journal.failed_game_ids(season, season_type)), 'GAME_ID'])
+    if failed:
+        raise RuntimeError(f"{len(failed)} games of {season} {season_type} failed to sync: {failed}. "
+                           f"Rerun to retry them, with retry_failed=True for games that used up max_attempts.")
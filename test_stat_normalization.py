@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from models import TradTeamStats, AdvTeamStats, TradPlayerStats, AdvPlayerStats
+from stat_normalization import normalize_stat_frame, stat_columns, stat_records, to_records
+
+
+PLAYER_IDS = {201939: 1, 1628369: 2, 203999: 3}
+TEAM_IDS = {1610612744: 10, 1610612738: 11}
+
+
+def make_boxscore(model):
+    """Boxscore frame with a played row, a DNP row of nulls, a row of string stats and, for players, an unknown player."""
+    entity_column, columns = stat_columns(model)
+    sources = [source for _, source, kind in columns if kind not in ("minutes", "season")]
+    if entity_column == "player_id":
+        rows = [
+            dict({source: 7 for source in sources}, PLAYER_ID=201939, MIN="34:12", START_POSITION="G"),
+            dict({source: None for source in sources}, PLAYER_ID=1628369, MIN=None, START_POSITION=None),
+            dict({source: "3" for source in sources}, PLAYER_ID=203999, MIN="5:00", START_POSITION=""),
+            dict({source: 2 for source in sources}, PLAYER_ID=1, MIN="12:00", START_POSITION="F"),
+        ]
+    else:
+        rows = [
+            dict({source: 101.5 for source in sources}, TEAM_ID=1610612744, MIN="240:00"),
+            dict({source: None for source in sources}, TEAM_ID=1610612738, MIN=None),
+        ]
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("model", [TradTeamStats, AdvTeamStats, TradPlayerStats, AdvPlayerStats])
+def test_per_game_records_match_frame_path(model):
+    entity_column, _ = stat_columns(model)
+    id_map = PLAYER_IDS if entity_column == "player_id" else TEAM_IDS
+    season = "2023-24" if "season" in model.__table__.columns else None
+    boxscore = make_boxscore(model)
+
+    frame_records = to_records(normalize_stat_frame(boxscore, model, 5, id_map, season=season))
+    records = stat_records(boxscore, model, 5, id_map, season=season)
+
+    assert records == frame_records
+    assert [{key: type(value) for key, value in record.items()} for record in records] == \
+        [{key: type(value) for key, value in record.items()} for record in frame_records]
+
+
+def test_dnp_rows_become_zeros():
+    boxscore = make_boxscore(TradPlayerStats)
+    records = stat_records(boxscore, TradPlayerStats, 5, PLAYER_IDS, season="2023-24")
+
+    assert [record["player_id"] for record in records] == [1, 2, 3]
+    dnp = records[1]
+    assert dnp["minutes"] == 0.0 and dnp["pts"] == 0 and dnp["fg_pct"] == 0.0 and dnp["start_position"] == ""
+
+
+def test_unknown_team_raises_on_both_paths():
+    boxscore = make_boxscore(TradTeamStats)
+    with pytest.raises(KeyError):
+        normalize_stat_frame(boxscore, TradTeamStats, 5, {1610612744: 10})
+    with pytest.raises(KeyError):
+        stat_records(boxscore, TradTeamStats, 5, {1610612744: 10})